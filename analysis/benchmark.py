@@ -1,12 +1,28 @@
-import time
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
 import sys
 import os
+import time
 
 # Add parent directory to path to import src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.rsa_core import generate_keypair as gen_gauss, encrypt as enc_gauss, generate_rational_prime
-from src.gaussian_math import GaussianInt
+from src.rsa_core import generate_keypair as gen_gauss, encrypt as enc_gauss, decrypt as dec_gauss
+from src.rsa_core import generate_rational_prime, key_context
+from src.gaussian_math import GaussianInt, gcd_gaussian, xgcd_gaussian, mod_inverse_gaussian
+from src.utils import encode_message, decode_message
+from src import instrument
+
+DEFAULT_SIZES = [256, 512, 1024, 2048, 4096]
+QUICK_SIZES = [128, 256, 512]
+
+# Two-sided 95% Student t critical values by degrees of freedom.
+T95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+       8: 2.306, 9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 30: 2.042}
 
 # Trivial Integer RSA for comparison
 def gen_rsa(bits):
@@ -28,48 +44,180 @@ def enc_rsa(m, pk):
     e, n = pk
     return pow(m, e, n)
 
-def run():
-    print("Gaussian RSA vs Standard RSA Benchmark")
-    print("======================================")
-    
-    bits_list = [64, 128, 256]
-    
-    for bits in bits_list:
-        print(f"\n--- Bit Length: {bits} ---")
-        
-        # Gaussian
-        start = time.time()
-        pk_g, _ = gen_gauss(bits)
-        t_gen_g = time.time() - start
-        
-        # Standard
-        start = time.time()
-        pk_s, _ = gen_rsa(bits)
-        t_gen_s = time.time() - start
-        
-        print(f"Key Generation:")
-        print(f"  Gaussian: {t_gen_g:.4f}s")
-        print(f"  Standard: {t_gen_s:.4f}s")
-        
-        # Encryption (100 operations)
-        msg_g = GaussianInt(12345, 12345)
-        msg_s = 1234512345
-        
-        start = time.time()
-        for _ in range(100):
-            enc_gauss(msg_g, pk_g)
-        t_enc_g = time.time() - start
-        
-        start = time.time()
-        for _ in range(100):
-            enc_rsa(msg_s, pk_s)
-        t_enc_s = time.time() - start
-        
-        print(f"Encryption (100 ops):")
-        print(f"  Gaussian: {t_enc_g:.4f}s")
-        print(f"  Standard: {t_enc_s:.4f}s")
-        if t_enc_s > 0:
-            print(f"  Slowdown: {t_enc_g/t_enc_s:.2f}x")
+def t95(df):
+    if df <= 0:
+        return float('nan')
+    for k in sorted(T95, reverse=True):
+        if df >= k:
+            return T95[k] if df <= 30 else 1.960
+    return T95[1]
+
+def measure(fn, reps, warmup, min_time=0.02):
+    """
+    Times fn() with perf_counter. Fast operations are looped so that each
+    sample lasts at least min_time; samples are per-call seconds.
+    """
+    for _ in range(warmup):
+        fn()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+    samples = [elapsed / number]
+    for _ in range(reps - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+
+    mean = statistics.fmean(samples)
+    stdev = statistics.stdev(samples) if len(samples) > 1 else 0.0
+    ci = t95(len(samples) - 1) * stdev / math.sqrt(len(samples)) if len(samples) > 1 else float('inf')
+    return {"mean": mean, "stdev": stdev, "ci95": ci, "reps": len(samples),
+            "loops": number, "samples": samples}
+
+def random_gaussian(rng, bits):
+    return GaussianInt(rng.getrandbits(bits) - (1 << (bits - 1)), rng.getrandbits(bits) - (1 << (bits - 1)))
+
+def bench_size(bits, args, rng):
+    results = {}
+    def record(name, fn, reps=args.reps, warmup=args.warmup):
+        r = measure(fn, reps, warmup)
+        results[f"{bits}/{name}"] = r
+        print(f"  {name:<18} {r['mean']*1e3:12.4f} ms  +/- {r['ci95']*1e3:.4f} ms (95% CI, n={r['reps']})")
+
+    print(f"\n--- Bit Length: {bits} ---")
+    record("keygen", lambda: gen_gauss(bits, crt=True), reps=args.keygen_reps, warmup=0)
+
+    pk, sk = gen_gauss(bits, crt=True)
+    pk_ctx, sk_ctx = key_context(pk), key_context(sk)
+    plain = sk[:2]
+    plain_ctx = key_context(plain)
+    N = pk[1]
+    msg = encode_message("benchmark", N.norm())[0]
+    ct = enc_gauss(msg, pk, pk_ctx)
+    assert dec_gauss(ct, sk, sk_ctx) == msg
+
+    record("encrypt", lambda: enc_gauss(msg, pk, pk_ctx))
+    record("decrypt", lambda: dec_gauss(ct, plain, plain_ctx))
+    record("decrypt_crt", lambda: dec_gauss(ct, sk, sk_ctx))
+    if args.primes > 2:
+        pk_m, sk_m = gen_gauss(bits, crt=True, primes=args.primes)
+        sk_m_ctx = key_context(sk_m)
+        msg_m = encode_message("benchmark", pk_m[1].norm())[0]
+        ct_m = enc_gauss(msg_m, pk_m)
+        assert dec_gauss(ct_m, sk_m, sk_m_ctx) == msg_m
+        record(f"decrypt_crt{args.primes}", lambda: dec_gauss(ct_m, sk_m, sk_m_ctx))
+
+    a, b = random_gaussian(rng, bits // 2), random_gaussian(rng, bits // 2)
+    record("gcd_gaussian", lambda: gcd_gaussian(a, b))
+    record("xgcd_gaussian", lambda: xgcd_gaussian(a, b))
+    u = ct
+    record("mod_inverse", lambda: mod_inverse_gaussian(u, N))
+
+    text = "".join(chr(rng.randrange(32, 127)) for _ in range(args.text_bytes))
+    chunks = encode_message(text, N.norm())
+    assert decode_message(chunks) == text
+    record("encode", lambda: encode_message(text, N.norm()))
+    record("decode", lambda: decode_message(chunks))
+    packed = encode_message(text, N.norm(), packed=True)
+    assert decode_message(packed, N.norm(), packed=True) == text
+    record("encode_packed", lambda: encode_message(text, N.norm(), packed=True))
+    record("decode_packed", lambda: decode_message(packed, N.norm(), packed=True))
+    print(f"  blocks per {args.text_bytes} bytes: {len(chunks)} plain, {len(packed)} packed")
+    for name in ("encode", "decode", "encode_packed", "decode_packed"):
+        r = results[f"{bits}/{name}"]
+        r["throughput_MBps"] = args.text_bytes / r["mean"] / 1e6
+
+    pk_s, sk_s = gen_rsa(bits)
+    record("rsa_encrypt", lambda: enc_rsa(1234512345, pk_s))
+    c_s = enc_rsa(1234512345, pk_s)
+    record("rsa_decrypt", lambda: enc_rsa(c_s, sk_s))
+    return results
+
+def instrumented_pass(sizes):
+    # One untimed keygen/encrypt/decrypt per size with operation counting
+    # on, kept apart from the timed runs so the wrappers do not skew them.
+    instrument.reset()
+    instrument.enable()
+    try:
+        for bits in sizes:
+            pk, sk = gen_gauss(bits, crt=True)
+            msg = encode_message("benchmark", pk[1].norm())[0]
+            dec_gauss(enc_gauss(msg, pk), sk)
+    finally:
+        instrument.disable()
+    print("\nInstrumented pass:")
+    print(instrument.report())
+    return instrument.stats()
+
+def compare(results, baseline, tolerance):
+    """
+    Returns the names whose time regressed against the baseline: the
+    lower end of the 95% CI is more than `tolerance` above the baseline mean.
+    """
+    regressions = []
+    print("\nComparison with baseline:")
+    for name, r in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = r["mean"] / base["mean"]
+        slow = r["mean"] - r["ci95"] > base["mean"] * (1 + tolerance)
+        flag = "  REGRESSION" if slow else ""
+        print(f"  {name:<24} {ratio:6.2f}x baseline{flag}")
+        if slow:
+            regressions.append(name)
+    return regressions
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description="Gaussian RSA benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", help="modulus sizes in bits")
+    parser.add_argument("--quick", action="store_true", help=f"use sizes {QUICK_SIZES}")
+    parser.add_argument("--reps", type=int, default=10, help="samples per benchmark")
+    parser.add_argument("--keygen-reps", type=int, default=3, help="samples for key generation")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed warmup calls")
+    parser.add_argument("--text-bytes", type=int, default=4096, help="message size for encode/decode")
+    parser.add_argument("--primes", type=int, default=3, help="also time CRT decryption with this many prime factors")
+    parser.add_argument("--seed", type=int, default=0, help="seed for test inputs")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown vs baseline")
+    parser.add_argument("--instrument", action="store_true", help="also report operation counts and phase times")
+    args = parser.parse_args(argv)
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+
+    print("Gaussian RSA Benchmark")
+    print("======================")
+    rng = random.Random(args.seed)
+    results = {}
+    for bits in sizes:
+        results.update(bench_size(bits, args, rng))
+    counts = instrumented_pass(sizes) if args.instrument else None
+
+    if args.output:
+        meta = {"python": platform.python_version(), "platform": platform.platform(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "sizes": sizes, "reps": args.reps}
+        data = {"meta": meta, "results": results}
+        if counts is not None:
+            data["instrument"] = counts
+        with open(args.output, "w") as f:
+            json.dump(data, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nFAILED: {len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+            return 1
+        print("\nNo regressions.")
+    return 0
 
 if __name__ == "__main__":
-    run()
+    sys.exit(run())
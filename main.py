@@ -4,7 +4,11 @@ import os
 # Ensure src is in path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.gui import main
-
 if __name__ == "__main__":
+    # With arguments, run the headless CLI (see src/cli.py) without
+    # importing tkinter; without, start the GUI.
+    if len(sys.argv) > 1:
+        from src.cli import main
+        sys.exit(main())
+    from src.gui import main
     main()
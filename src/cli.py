@@ -0,0 +1,163 @@
+import argparse
+import os
+import sys
+import time
+
+# Headless command line: python -m src.cli <command> ...
+#
+#   keygen [--bits B] [--primes K] [--workers W] [--seed S] [--label L]
+#                                                 generate and store a key
+#   encrypt-file SRC DST [--key ID]               encrypt into a container
+#   decrypt-file SRC DST [--key ID]               decrypt a container
+#   bench [--bits B] [--blocks N] [--startup]     time the core operations
+#
+# Keys live in a KeyStore (--store, default keystore.DEFAULT_PATH); --key
+# takes any unique id prefix and defaults to the latest stored key.
+#
+# Nothing beyond the standard library's argparse is imported at module
+# level. Each command imports what it needs, so short-lived processes pay
+# only for the modules their command uses, and never for tkinter.
+
+# Time a file command may spend importing its modules, on top of the
+# bare interpreter start, checked by `bench --startup`.
+STARTUP_BUDGET = 0.060
+
+# Modules loaded by keygen, encrypt-file and decrypt-file.
+FILE_COMMAND_IMPORTS = "import src.cli, src.keystore, src.stream"
+
+def _open_store(args):
+    from .keystore import KeyStore, DEFAULT_PATH
+    return KeyStore(args.store or DEFAULT_PATH)
+
+def _key_id(store, args):
+    if args.key is not None:
+        return store.resolve(args.key)
+    key_id = store.latest()
+    if key_id is None:
+        raise ValueError("Key store is empty; run keygen first")
+    return key_id
+
+def cmd_keygen(args):
+    from .rsa_core import generate_keypair
+    store = _open_store(args)
+    start = time.perf_counter()
+    keypair = generate_keypair(args.bits, crt=True, primes=args.primes,
+                               workers=args.workers, seed=args.seed)
+    dt = time.perf_counter() - start
+    key_id = store.put(keypair, label=args.label)
+    print(key_id)
+    print(f"{args.bits}-bit key, {args.primes} primes, generated in {dt:.3f}s", file=sys.stderr)
+    return 0
+
+def cmd_encrypt_file(args):
+    from .stream import encrypt_file
+    store = _open_store(args)
+    encrypt_file(args.src, args.dst, store.public_key(_key_id(store, args)))
+    return 0
+
+def cmd_decrypt_file(args):
+    from .stream import decrypt_file
+    store = _open_store(args)
+    key_id = _key_id(store, args)
+    decrypt_file(args.src, args.dst, store.private_key(key_id))
+    return 0
+
+def _best_time(cmd, runs):
+    import subprocess
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def startup_time(runs=5):
+    """
+    (interpreter, with imports) best-of-runs wall times in seconds for a
+    bare `python -c pass` and for a process importing what the file
+    commands need.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    bare = _best_time([sys.executable, "-c", "pass"], runs)
+    full = _best_time([sys.executable, "-c", f"import sys; sys.path.insert(0, {root!r}); "
+                       + FILE_COMMAND_IMPORTS], runs)
+    return bare, full
+
+def cmd_bench(args):
+    if args.startup:
+        bare, full = startup_time(args.runs)
+        over = full - bare
+        print(f"interpreter start   {bare * 1e3:8.2f} ms")
+        print(f"with imports        {full * 1e3:8.2f} ms  (+{over * 1e3:.2f} ms, "
+              f"budget {STARTUP_BUDGET * 1e3:.0f} ms)")
+        if over > STARTUP_BUDGET:
+            print("FAILED: import time over budget")
+            return 1
+        return 0
+
+    from .rsa_core import generate_keypair, encrypt, decrypt, key_context
+    from .utils import encode_message
+    start = time.perf_counter()
+    pk, sk = generate_keypair(args.bits, crt=True, primes=args.primes)
+    keygen = time.perf_counter() - start
+    pk_ctx, sk_ctx = key_context(pk), key_context(sk)
+    msg = encode_message("benchmark", pk[1].norm())[0]
+
+    start = time.perf_counter()
+    for _ in range(args.blocks):
+        c = encrypt(msg, pk, pk_ctx)
+    enc = (time.perf_counter() - start) / args.blocks
+    start = time.perf_counter()
+    for _ in range(args.blocks):
+        m = decrypt(c, sk, sk_ctx)
+    dec = (time.perf_counter() - start) / args.blocks
+    assert m == msg
+
+    print(f"{args.bits}-bit Gaussian RSA, {args.primes} primes, {args.blocks} blocks")
+    print(f"keygen    {keygen * 1e3:10.3f} ms")
+    print(f"encrypt   {enc * 1e3:10.4f} ms/block")
+    print(f"decrypt   {dec * 1e3:10.4f} ms/block (CRT)")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Gaussian RSA command line")
+    parser.add_argument("--store", help="key store directory (default: ~/.gaussian_rsa/keys)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("keygen", help="generate a keypair and add it to the store")
+    p.add_argument("--bits", type=int, default=1024, help="modulus size in bits")
+    p.add_argument("--primes", type=int, default=2, help="prime factors of the modulus")
+    p.add_argument("--workers", type=int, default=1, help="processes searching for primes")
+    p.add_argument("--seed", help="seed for a reproducible key (testing only)")
+    p.add_argument("--label", help="label kept in the store index")
+    p.set_defaults(func=cmd_keygen)
+
+    for name, func, what in (("encrypt-file", cmd_encrypt_file, "encrypt a file into a ciphertext container"),
+                             ("decrypt-file", cmd_decrypt_file, "decrypt a ciphertext container")):
+        p = sub.add_parser(name, help=what)
+        p.add_argument("src")
+        p.add_argument("dst")
+        p.add_argument("--key", help="key id or unique prefix (default: latest key)")
+        p.set_defaults(func=func)
+
+    p = sub.add_parser("bench", help="time keygen, encrypt and decrypt")
+    p.add_argument("--bits", type=int, default=1024, help="modulus size in bits")
+    p.add_argument("--primes", type=int, default=2, help="prime factors of the modulus")
+    p.add_argument("--blocks", type=int, default=100, help="blocks to encrypt and decrypt")
+    p.add_argument("--startup", action="store_true",
+                   help="measure process startup instead; exits 1 over the budget")
+    p.add_argument("--runs", type=int, default=5, help="processes started per startup measurement")
+    p.set_defaults(func=cmd_bench)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, KeyError, ValueError) as exc:
+        msg = exc.args[0] if isinstance(exc, KeyError) else exc
+        print(f"error: {msg}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
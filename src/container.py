@@ -0,0 +1,114 @@
+import math
+import mmap
+import struct
+from .gaussian_math import GaussianInt
+from .rsa_core import key_fingerprint
+
+# Binary ciphertext container, version 1. All integers are big-endian.
+#
+#   magic     4 bytes   b"GRSA"
+#   version   u8        1
+#   flags     u8        reserved, 0
+#   width     u16       bytes per component
+#   key       32 bytes  key_fingerprint of the modulus
+#   blocks    2 * width bytes each: real then imag, signed
+#
+# The block count follows from the file size, so blocks can be appended
+# as they are produced.
+
+MAGIC = b"GRSA"
+VERSION = 1
+HEADER = struct.Struct(">4sBBH32s")
+
+def component_width(N):
+    """
+    Bytes per signed component for residues modulo N. Canonical residues
+    have |real|, |imag| <= sqrt(N.norm()).
+    """
+    return ((math.isqrt(N.norm()) + 1).bit_length() + 8) // 8
+
+class CiphertextWriter:
+    """
+    Writes ciphertext blocks for `key` to a binary file object.
+    """
+    def __init__(self, f, key):
+        N = key[1]
+        self.f = f
+        self.width = component_width(N)
+        f.write(HEADER.pack(MAGIC, VERSION, 0, self.width, key_fingerprint(key)))
+
+    def write(self, block):
+        w = self.width
+        self.f.write(block.real.to_bytes(w, 'big', signed=True)
+                     + block.imag.to_bytes(w, 'big', signed=True))
+
+    def write_all(self, blocks):
+        for block in blocks:
+            self.write(block)
+
+class CiphertextReader:
+    """
+    Memory-maps a ciphertext file and decodes blocks lazily on access.
+    Blocks are read through a memoryview, without copying the file.
+    """
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Not a ciphertext file: empty")
+        self._view = memoryview(self._map)
+        try:
+            self._parse_header()
+        except ValueError:
+            self.close()
+            raise
+
+    def _parse_header(self):
+        if len(self._view) < HEADER.size:
+            raise ValueError("Not a ciphertext file: truncated header")
+        magic, version, _, width, fingerprint = HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise ValueError("Not a ciphertext file: bad magic")
+        if version != VERSION:
+            raise ValueError(f"Unsupported ciphertext version {version}")
+        if width == 0 or (len(self._view) - HEADER.size) % (2 * width):
+            raise ValueError("Corrupt ciphertext file: partial block")
+        self.version = version
+        self.width = width
+        self.fingerprint = fingerprint
+        self._count = (len(self._view) - HEADER.size) // (2 * width)
+
+    def check_key(self, key):
+        if key_fingerprint(key) != self.fingerprint:
+            raise ValueError("Ciphertext was not produced with this key")
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("block index out of range")
+        w = self.width
+        start = HEADER.size + 2 * w * index
+        view = self._view
+        return GaussianInt(int.from_bytes(view[start : start + w], 'big', signed=True),
+                           int.from_bytes(view[start + w : start + 2 * w], 'big', signed=True))
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
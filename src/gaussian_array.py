@@ -0,0 +1,191 @@
+from .gaussian_math import GaussianInt
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Components are kept as int64 when every value fits; an operation runs in
+# int64 only if its inputs are small enough that no intermediate can
+# overflow, and falls back to object arrays of Python ints otherwise.
+INT64_MAX = (1 << 63) - 1
+ADD_LIMIT = 1 << 62     # a + b stays in int64
+MUL_LIMIT = 1 << 31     # a*c - b*d stays in int64
+DIV_LIMIT = 1 << 30     # 2*(a*c + b*d) + N(b) stays in int64
+
+def _magnitude(a):
+    if isinstance(a, int):
+        return abs(a)
+    if a.size == 0:
+        return 0
+    return max(abs(int(a.max())), abs(int(a.min())))
+
+def _prepare(limit, *parts):
+    # Casts array parts to int64 if all parts are below limit, else to object.
+    dtype = np.int64 if all(_magnitude(p) < limit for p in parts) else object
+    return [p if isinstance(p, int) else p.astype(dtype, copy=False) for p in parts]
+
+def _pack(a):
+    # int64 where the values fit, object array of Python ints otherwise.
+    a = np.asarray(a)
+    if a.dtype == np.int64:
+        return a
+    if a.dtype.kind in 'iub' and a.dtype.itemsize < 8:
+        return a.astype(np.int64)
+    a = a.astype(object)
+    return a.astype(np.int64) if _magnitude(a) <= INT64_MAX else a
+
+class GaussianArray:
+    """
+    A batch of Gaussian integers stored as parallel real and imaginary
+    NumPy arrays. Elementwise operations run as whole-array operations
+    instead of per-object Python dispatch, with the same results (and the
+    same divmod rounding) as GaussianInt.
+
+    The other operand can be a GaussianArray of the same length, a
+    GaussianInt or an int.
+    """
+    __slots__ = ('real', 'imag')
+
+    def __init__(self, real, imag=None):
+        if np is None:
+            raise ImportError("GaussianArray requires NumPy")
+        real = _pack(real)
+        imag = np.zeros(real.shape, dtype=np.int64) if imag is None else _pack(imag)
+        if real.ndim != 1 or real.shape != imag.shape:
+            raise ValueError("real and imag must be 1-D arrays of the same length")
+        self.real = real
+        self.imag = imag
+
+    @classmethod
+    def from_gaussians(cls, values):
+        values = [GaussianInt(v) if isinstance(v, int) else v for v in values]
+        return cls([v.real for v in values], [v.imag for v in values])
+
+    def to_list(self):
+        return [GaussianInt(int(r), int(i)) for r, i in zip(self.real, self.imag)]
+
+    def __len__(self):
+        return len(self.real)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return GaussianInt(int(self.real[index]), int(self.imag[index]))
+        return GaussianArray(self.real[index], self.imag[index])
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __repr__(self):
+        return f"GaussianArray({self.to_list()!r})"
+
+    def _operand(self, other):
+        if isinstance(other, GaussianArray):
+            if len(other) != len(self):
+                raise ValueError("GaussianArray length mismatch")
+            return other.real, other.imag
+        if isinstance(other, GaussianInt):
+            return other.real, other.imag
+        if isinstance(other, int):
+            return other, 0
+        return None
+
+    def __add__(self, other):
+        o = self._operand(other)
+        if o is None:
+            return NotImplemented
+        ar, ai, br, bi = _prepare(ADD_LIMIT, self.real, self.imag, *o)
+        return GaussianArray(ar + br, ai + bi)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        o = self._operand(other)
+        if o is None:
+            return NotImplemented
+        ar, ai, br, bi = _prepare(ADD_LIMIT, self.real, self.imag, *o)
+        return GaussianArray(ar - br, ai - bi)
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __neg__(self):
+        ar, ai = _prepare(ADD_LIMIT, self.real, self.imag)
+        return GaussianArray(-ar, -ai)
+
+    def __mul__(self, other):
+        o = self._operand(other)
+        if o is None:
+            return NotImplemented
+        ar, ai, br, bi = _prepare(MUL_LIMIT, self.real, self.imag, *o)
+        return GaussianArray(ar * br - ai * bi, ar * bi + ai * br)
+
+    __rmul__ = __mul__
+
+    def conj(self):
+        return GaussianArray(self.real, -_prepare(ADD_LIMIT, self.imag)[0])
+
+    def norm(self):
+        ar, ai = _prepare(MUL_LIMIT, self.real, self.imag)
+        return _pack(ar * ar + ai * ai)
+
+    def __divmod__(self, other):
+        # Same nearest-integer rounding as GaussianInt.__divmod__.
+        o = self._operand(other)
+        if o is None:
+            return NotImplemented
+        ar, ai, br, bi = _prepare(DIV_LIMIT, self.real, self.imag, *o)
+        denom = br * br + bi * bi
+        if np.any(denom == 0):
+            raise ZeroDivisionError("GaussianArray division by zero")
+        num_r = ar * br + ai * bi
+        num_i = ai * br - ar * bi
+        qr = (2 * num_r + denom) // (2 * denom)
+        qi = (2 * num_i + denom) // (2 * denom)
+        rr = ar - (br * qr - bi * qi)
+        ri = ai - (br * qi + bi * qr)
+        return GaussianArray(qr, qi), GaussianArray(rr, ri)
+
+    def __floordiv__(self, other):
+        q, _ = divmod(self, other)
+        return q
+
+    def __mod__(self, other):
+        _, r = divmod(self, other)
+        return r
+
+    def pow_mod(self, exp, mod):
+        """
+        Elementwise self^exp % mod for a shared exponent and modulus,
+        matching mod_pow_gaussian.
+        """
+        if not isinstance(exp, int):
+            raise ValueError("Exponent should be integer")
+        if exp < 0:
+            raise ValueError("Negative exponent (use mod_inverse_gaussian)")
+        if exp == 0:
+            # 1 % mod, which is 0 when mod is a unit.
+            ones = GaussianArray(np.ones(len(self), dtype=np.int64), np.zeros(len(self), dtype=np.int64))
+            return ones % mod
+        # Left-to-right square-and-multiply, one whole-array step per bit.
+        base = self % mod
+        result = base
+        for bit in bin(exp)[3:]:
+            result = (result * result) % mod
+            if bit == '1':
+                result = (result * base) % mod
+        return result
+
+    def __pow__(self, exp, mod=None):
+        if mod is not None:
+            return self.pow_mod(exp, mod)
+        if not isinstance(exp, int) or exp < 0:
+            return NotImplemented
+        result = GaussianArray(np.ones(len(self), dtype=np.int64), np.zeros(len(self), dtype=np.int64))
+        base = self
+        while exp > 0:
+            if exp % 2 == 1:
+                result = result * base
+            base = base * base
+            exp //= 2
+        return result
@@ -1,28 +1,85 @@
 import math
-import random
 
 class GaussianInt:
+    # Immutable value type: two slots and no per-instance __dict__,
+    # hashable so instances can be used as dict keys and set members.
+    __slots__ = ('real', 'imag')
+
     def __init__(self, r, i=0):
-        self.real = r
-        self.imag = i
+        _set_real(self, r)
+        _set_imag(self, i)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GaussianInt is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("GaussianInt is immutable")
+
+    def __reduce__(self):
+        return (GaussianInt, (self.real, self.imag))
+
+    def __hash__(self):
+        # Must agree with __eq__, which treats GaussianInt(n, 0) == n.
+        if self.imag == 0:
+            return hash(self.real)
+        return hash((self.real, self.imag))
 
     def __add__(self, other):
         if isinstance(other, int):
             return GaussianInt(self.real + other, self.imag)
-        return GaussianInt(self.real + other.real, self.imag + other.imag)
+        if isinstance(other, GaussianInt):
+            return GaussianInt(self.real + other.real, self.imag + other.imag)
+        return NotImplemented
+
+    __radd__ = __add__
 
     def __sub__(self, other):
         if isinstance(other, int):
             return GaussianInt(self.real - other, self.imag)
-        return GaussianInt(self.real - other.real, self.imag - other.imag)
+        if isinstance(other, GaussianInt):
+            return GaussianInt(self.real - other.real, self.imag - other.imag)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, int):
+            return GaussianInt(other - self.real, -self.imag)
+        return NotImplemented
 
     def __mul__(self, other):
         if isinstance(other, int):
             return GaussianInt(self.real * other, self.imag * other)
-        return GaussianInt(
-            self.real * other.real - self.imag * other.imag,
-            self.real * other.imag + self.imag * other.real
-        )
+        if isinstance(other, GaussianInt):
+            return GaussianInt(
+                self.real * other.real - self.imag * other.imag,
+                self.real * other.imag + self.imag * other.real
+            )
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return GaussianInt(-self.real, -self.imag)
+
+    def __pos__(self):
+        return self
+
+    def __pow__(self, exp, mod=None):
+        if mod is not None:
+            if isinstance(exp, int) and exp < 0:
+                return mod_pow_gaussian(mod_inverse_gaussian(self, mod), -exp, mod)
+            return mod_pow_gaussian(self, exp, mod)
+        if not isinstance(exp, int):
+            return NotImplemented
+        if exp < 0:
+            raise ValueError("Negative exponent needs a modulus (use mod_inverse_gaussian)")
+        result = GaussianInt(1)
+        base = self
+        while exp > 0:
+            if exp % 2 == 1:
+                result = result * base
+            base = base * base
+            exp //= 2
+        return result
 
     def norm(self):
         return self.real**2 + self.imag**2
@@ -30,10 +87,9 @@ class GaussianInt:
     def __eq__(self, other):
         if isinstance(other, int):
             return self.real == other and self.imag == 0
-        return self.real == other.real and self.imag == other.imag
-    
-    def __ne__(self, other):
-        return not self.__eq__(other)
+        if isinstance(other, GaussianInt):
+            return self.real == other.real and self.imag == other.imag
+        return NotImplemented
 
     def __repr__(self):
         if self.imag >= 0:
@@ -53,6 +109,8 @@ class GaussianInt:
         # Round to nearest integer
         if isinstance(other, int):
              other = GaussianInt(other, 0)
+        elif not isinstance(other, GaussianInt):
+            return NotImplemented
              
         num = self * other.conj()
         denom = other.norm()
@@ -70,20 +128,116 @@ class GaussianInt:
         r = self - other * q
         return q, r
 
+    def __rdivmod__(self, other):
+        if isinstance(other, int):
+            return divmod(GaussianInt(other), self)
+        return NotImplemented
+
+    def __floordiv__(self, other):
+        q, _ = divmod(self, other)
+        return q
+
+    def __rfloordiv__(self, other):
+        q, _ = divmod(other, self)
+        return q
+
     def __mod__(self, other):
         _, r = divmod(self, other)
         return r
 
+    def __rmod__(self, other):
+        _, r = divmod(other, self)
+        return r
+
+# Slot setters used by __init__, bypassing the immutability guard.
+_set_real = GaussianInt.real.__set__
+_set_imag = GaussianInt.imag.__set__
+
+# Lehmer-style acceleration of the Euclidean algorithm in Z[i]. Runs of
+# quotients are computed on the leading LEHMER_BITS bits of the operands
+# only, and a quotient is accepted only if an error bound proves that the
+# full-precision rounding gives the same value. The accumulated 2x2
+# matrix of small Gaussian integers is then applied to the full values in
+# one go. The quotient sequence, and so every result, is exactly that of
+# repeated GaussianInt.__divmod__.
+LEHMER_BITS = 60
+LEHMER_MIN_BITS = 128   # plain steps are cheaper below this size
+
+def _lehmer_matrix(ar, ai, br, bi, shift):
+    # Returns (m00, m01, m10, m11), as 8 ints (real, imag of each), such
+    # that (m00 a + m01 b, m10 a + m11 b) is the pair reached after the
+    # proven steps; None if not even one step could be proven.
+    Ar, Ai, Br, Bi = ar >> shift, ai >> shift, br >> shift, bi >> shift
+    m00r, m00i, m01r, m01i, m10r, m10i, m11r, m11i = 1, 0, 0, 0, 0, 0, 1, 0
+    steps = 0
+    while True:
+        # Truncation errors of a and b are below sqrt(2) (in units of
+        # 2^shift), so those of A and B are below sqrt(2) * (|m0| + |m1|).
+        eA = math.sqrt(2) * (math.hypot(m00r, m00i) + math.hypot(m01r, m01i))
+        eB = math.sqrt(2) * (math.hypot(m10r, m10i) + math.hypot(m11r, m11i))
+        d = Br * Br + Bi * Bi
+        absB = math.sqrt(d)
+        if absB <= 2 * eB + 1:
+            break
+        absA = math.hypot(Ar, Ai)
+        # |A/B - A'/B'| <= (eA|B'| + |A'|eB) / (|B'|(|B'| - eB)),
+        # padded for float rounding.
+        delta = (eA * absB + absA * eB) / (absB * (absB - eB)) * 1.001 + 1e-12
+
+        nr = 2 * (Ar * Br + Ai * Bi) + d
+        ni = 2 * (Ai * Br - Ar * Bi) + d
+        qr = nr // (2 * d)
+        qi = ni // (2 * d)
+        # Position of A'/B' + 1/2 between rounding boundaries, per component.
+        fr = (nr - 2 * d * qr) / (2 * d)
+        fi = (ni - 2 * d * qi) / (2 * d)
+        if not (delta < fr < 1 - delta and delta < fi < 1 - delta):
+            break
+
+        Ar, Ai, Br, Bi = Br, Bi, Ar - (Br * qr - Bi * qi), Ai - (Br * qi + Bi * qr)
+        m00r, m00i, m01r, m01i, m10r, m10i, m11r, m11i = (
+            m10r, m10i, m11r, m11i,
+            m00r - (m10r * qr - m10i * qi), m00i - (m10r * qi + m10i * qr),
+            m01r - (m11r * qr - m11i * qi), m01i - (m11r * qi + m11i * qr))
+        steps += 1
+    if not steps:
+        return None
+    return m00r, m00i, m01r, m01i, m10r, m10i, m11r, m11i
+
+def _apply(m, u0r, u0i, u1r, u1i):
+    # (u0, u1) -> (m00 u0 + m01 u1, m10 u0 + m11 u1)
+    m00r, m00i, m01r, m01i, m10r, m10i, m11r, m11i = m
+    return (m00r * u0r - m00i * u0i + m01r * u1r - m01i * u1i,
+            m00r * u0i + m00i * u0r + m01r * u1i + m01i * u1r,
+            m10r * u0r - m10i * u0i + m11r * u1r - m11i * u1i,
+            m10r * u0i + m10i * u0r + m11r * u1i + m11i * u1r)
+
+def _euclid(ar, ai, br, bi, cofactors=()):
+    # Euclidean algorithm on raw pairs; returns the last nonzero remainder.
+    # Each cofactor row [u0r, u0i, u1r, u1i] follows (u0, u1) <- (u1, u0 - q*u1)
+    # and is updated in place.
+    while br or bi:
+        m = None
+        bits = max(abs(ar), abs(ai), abs(br), abs(bi)).bit_length()
+        if bits > LEHMER_MIN_BITS:
+            m = _lehmer_matrix(ar, ai, br, bi, bits - LEHMER_BITS)
+        if m is None:
+            # One full-precision step, as in GaussianInt.__divmod__.
+            d = br * br + bi * bi
+            qr = (2 * (ar * br + ai * bi) + d) // (2 * d)
+            qi = (2 * (ai * br - ar * bi) + d) // (2 * d)
+            m = (0, 0, 1, 0, 1, 0, -qr, -qi)
+        ar, ai, br, bi = _apply(m, ar, ai, br, bi)
+        for row in cofactors:
+            row[:] = _apply(m, *row)
+    return ar, ai
+
 def gcd_gaussian(a, b):
     # Ensure inputs are GaussianInt
     if isinstance(a, int): a = GaussianInt(a)
     if isinstance(b, int): b = GaussianInt(b)
     
-    while b.norm() != 0:
-        _, r = divmod(a, b)
-        a = b
-        b = r
-    return a
+    return GaussianInt(*_euclid(a.real, a.imag, b.real, b.imag))
 
 def xgcd_gaussian(a, b):
     # Extended Euclidean Algorithm
@@ -91,42 +245,174 @@ def xgcd_gaussian(a, b):
     if isinstance(a, int): a = GaussianInt(a)
     if isinstance(b, int): b = GaussianInt(b)
 
-    x0, x1, y0, y1 = GaussianInt(1), GaussianInt(0), GaussianInt(0), GaussianInt(1)
-    while b.norm() != 0:
-        q, r = divmod(a, b)
-        a, b = b, r
-        x0, x1 = x1, x0 - q * x1
-        y0, y1 = y1, y0 - q * y1
-    return a, x0, y0
+    # Rows (x0, x1) and (y0, y1), starting from x0 = 1, y1 = 1.
+    xs, ys = [1, 0, 0, 0], [0, 0, 1, 0]
+    g = _euclid(a.real, a.imag, b.real, b.imag, (xs, ys))
+    return GaussianInt(*g), GaussianInt(xs[0], xs[1]), GaussianInt(ys[0], ys[1])
+
+class ReductionContext:
+    # Precomputed constants for repeated reduction modulo a fixed N.
+    # Build one per key and pass it to mod_pow_gaussian (or encrypt/decrypt)
+    # so the setup is paid once, not per block.
+    #
+    # Barrett-style: conj(N) / N(N) is stored as a fixed-point Gaussian
+    # number W = conj(N) * 2^shift / N(N), so the quotient of x by N is
+    # estimated as (x >> trunc) * W >> (shift - trunc) with multiplies and
+    # shifts only. The estimate is within 1 of the rounded quotient, so
+    # reduce() returns a small but not canonical representative;
+    # canonical() does the exact GaussianInt.__divmod__ rounding.
+    __slots__ = ('modulus', 'real', 'imag', 'norm',
+                 'trunc', 'shift', 'half', 'w_real', 'w_imag')
+
+    def __init__(self, modulus):
+        if isinstance(modulus, int): modulus = GaussianInt(modulus)
+        nr, ni = modulus.real, modulus.imag
+        norm = nr * nr + ni * ni
+        if norm == 0:
+            raise ZeroDivisionError("Reduction modulo zero")
+        bits = norm.bit_length()
+
+        self.modulus = modulus
+        self.real = nr
+        self.imag = ni
+        self.norm = norm
+        # Outputs of reduce() have norm below 1.5 N(N), so a product of two
+        # of them has components below 2^(bits + 1). Truncation and
+        # precision are chosen so that for such inputs the quotient estimate
+        # is off by less than 1/2 before rounding.
+        self.trunc = max((bits >> 1) - 3, 0)
+        self.shift = bits + 6 - self.trunc
+        self.half = 1 << (self.shift - 1)
+        scale = 1 << (bits + 7)
+        self.w_real = (nr * scale + norm) // (2 * norm)
+        self.w_imag = (-ni * scale + norm) // (2 * norm)
+
+    def reduce(self, xr, xi):
+        # Small representative of x mod N, for x a product of two
+        # reduced values.
+        nr, ni = self.real, self.imag
+        wr, wi = self.w_real, self.w_imag
+        t, s, h = self.trunc, self.shift, self.half
+        yr, yi = xr >> t, xi >> t
+        qr = (yr * wr - yi * wi + h) >> s
+        qi = (yr * wi + yi * wr + h) >> s
+        return xr - (nr * qr - ni * qi), xi - (nr * qi + ni * qr)
+
+    def canonical(self, xr, xi):
+        # Exact x % N, same rounding as GaussianInt.__divmod__.
+        nr, ni, norm = self.real, self.imag, self.norm
+        d = 2 * norm
+        qr = (2 * (xr * nr + xi * ni) + norm) // d
+        qi = (2 * (xi * nr - xr * ni) + norm) // d
+        return xr - (nr * qr - ni * qi), xi - (nr * qi + ni * qr)
+
+    def state(self):
+        # The constants from_state needs, as a tuple of ints.
+        return (self.real, self.imag, self.trunc, self.shift, self.w_real, self.w_imag)
+
+    @classmethod
+    def from_state(cls, state):
+        # Rebuilds a context from state() without redoing the divisions.
+        nr, ni, trunc, shift, w_real, w_imag = state
+        ctx = cls.__new__(cls)
+        ctx.modulus = GaussianInt(nr, ni)
+        ctx.real, ctx.imag = nr, ni
+        ctx.norm = nr * nr + ni * ni
+        ctx.trunc, ctx.shift, ctx.half = trunc, shift, 1 << (shift - 1)
+        ctx.w_real, ctx.w_imag = w_real, w_imag
+        return ctx
+
+    def mod(self, a):
+        # a % N for a GaussianInt or int a.
+        if isinstance(a, int): return GaussianInt(*self.canonical(a, 0))
+        return GaussianInt(*self.canonical(a.real, a.imag))
+
+    def mul(self, ar, ai, br, bi):
+        return self.reduce(ar * br - ai * bi, ar * bi + ai * br)
+
+    def sqr(self, ar, ai):
+        # Squaring needs two multiplies instead of four.
+        return self.reduce((ar + ai) * (ar - ai), 2 * ar * ai)
 
-def mod_pow_gaussian(base, exp, mod):
+def _window_size(bits):
+    # Window widths for sliding-window exponentiation by exponent length.
+    if bits > 671: return 6
+    if bits > 239: return 5
+    if bits > 79: return 4
+    if bits > 23: return 3
+    return 1
+
+def sliding_window_steps(exp, w=None):
+    # Left-to-right sliding-window recoding of exp > 0.
+    # Returns (steps, tail): each step (s, k) means "square s times, then
+    # multiply by base^k" (k odd, k < 2^w); tail is the number of squarings
+    # left after the last step. The first step's squarings act on 1 and
+    # are skipped.
+    if w is None:
+        w = _window_size(exp.bit_length())
+    steps = []
+    pending = 0
+    i = exp.bit_length() - 1
+    while i >= 0:
+        if not (exp >> i) & 1:
+            pending += 1
+            i -= 1
+            continue
+        j = max(i - w + 1, 0)
+        while not (exp >> j) & 1:
+            j += 1
+        k = (exp >> j) & ((1 << (i - j + 1)) - 1)
+        steps.append((pending + i - j + 1, k))
+        pending = 0
+        i = j - 1
+    return steps, pending
+
+def mod_pow_gaussian(base, exp, mod, ctx=None, window=None):
     # base^exp % mod
-    if isinstance(base, int): base = GaussianInt(base)
-    
-    result = GaussianInt(1)
-    # Handle integer exponent
-    if isinstance(exp, int):
-        while exp > 0:
-            if exp % 2 == 1:
-                result = (result * base) % mod
-            base = (base * base) % mod
-            exp //= 2
-        return result
-    else:
+    # ctx is an optional ReductionContext for mod and window an optional
+    # sliding_window_steps(exp), both reusable across calls.
+    if not isinstance(exp, int):
         raise ValueError("Exponent should be integer")
+    if exp < 0:
+        raise ValueError("Negative exponent (use mod_inverse_gaussian)")
+    if exp == 0:
+        # 1 % mod, which is 0 when mod is a unit.
+        return GaussianInt(1) % mod
+    if isinstance(base, int): base = GaussianInt(base)
+    if ctx is None:
+        ctx = ReductionContext(mod)
+
+    # Work on raw integer pairs, lazily reduced; only the final result
+    # is brought to the canonical residue.
+    steps, tail = window or sliding_window_steps(exp)
+    sqr, mul = ctx.sqr, ctx.mul
+
+    # Odd powers base^1, base^3, ..., as needed by the recoding.
+    br, bi = ctx.canonical(base.real, base.imag)
+    table = {1: (br, bi)}
+    top = max(k for _, k in steps)
+    if top > 1:
+        b2r, b2i = sqr(br, bi)
+        for k in range(3, top + 1, 2):
+            pr, pi = table[k - 2]
+            table[k] = mul(pr, pi, b2r, b2i)
+
+    rr, ri = table[steps[0][1]]
+    for s, k in steps[1:]:
+        for _ in range(s):
+            rr, ri = sqr(rr, ri)
+        kr, ki = table[k]
+        rr, ri = mul(rr, ri, kr, ki)
+    for _ in range(tail):
+        rr, ri = sqr(rr, ri)
+    return GaussianInt(*ctx.canonical(rr, ri))
 
 def mod_inverse_gaussian(a, m):
     # Find x such that ax = 1 (mod m)
     # ax + my = 1
     g, x, y = xgcd_gaussian(a, m)
     if g.norm() != 1:
-        # Check if g is a unit (1, -1, i, -i)
-        # If g is a unit, say 'u', then u * u^-1 = 1.
-        # We have a*x + m*y = u.
-        # Multiply by u^-1: a*(x*u^-1) + m*(y*u^-1) = 1.
-        # So inverse is x * u^-1.
-        if g.norm() == 1: # Unit check
-             return (x * g.conj()) % m # Inverse of unit is its conjugate
-        
         raise ValueError(f"Modular inverse does not exist (GCD norm = {g.norm()})")
-    return x % m
+    # g is a unit u (1, -1, i, -i), so a*x = u (mod m).
+    # Multiply by u^-1 = conj(u): a*(x*conj(u)) = 1 (mod m).
+    return (x * g.conj()) % m
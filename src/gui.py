@@ -1,9 +1,47 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import threading
+import os
 import time
-from .rsa_core import generate_keypair, encrypt, decrypt
+from .rsa_core import generate_keypair, encrypt_batch, decrypt_batch
 from .utils import encode_message, decode_message
+from .jobs import JobRunner
+from .keystore import KeyStore, DEFAULT_PATH
+
+def split_tasks(fn, blocks, key, parts):
+    # Slices of blocks as JobRunner tasks; each slice is processed
+    # in-process (workers=1) by one pool worker.
+    size = max(1, -(-len(blocks) // parts))
+    return [(fn, (blocks[i : i + size], key, 1)) for i in range(0, len(blocks), size)]
+
+def benchmark_report(bits=128):
+    # Runs in a worker process (see run_benchmark).
+    from .rsa_core import encrypt, decrypt, key_context
+    from .gaussian_math import GaussianInt
+    
+    pk, sk = generate_keypair(bits, crt=True)
+    msg = GaussianInt(12345, 67890)
+    pk_ctx, sk_ctx = key_context(pk), key_context(sk)
+    
+    start = time.time()
+    for _ in range(100):
+        c = encrypt(msg, pk, pk_ctx)
+    enc_time = time.time() - start
+    
+    start = time.time()
+    for _ in range(100):
+        decrypt(c, sk, sk_ctx)
+    dec_time = time.time() - start
+    
+    # Since we don't have standard RSA here to import easily without dependency,
+    # We will just report raw speed.
+    
+    res = f"Benchmark Results ({bits}-bit Gaussian RSA):\n"
+    res += f"Encryption (100 ops): {enc_time:.4f}s\n"
+    res += f"Avg Encryption Time: {enc_time/100:.6f}s\n"
+    res += f"Decryption (100 ops, CRT): {dec_time:.4f}s\n"
+    res += f"Avg Decryption Time: {dec_time/100:.6f}s\n"
+    res += f"Note: Python implementation is interpreted, C++ would be faster.\n"
+    return res
 
 class GaussianRSAGUI:
     def __init__(self, root):
@@ -13,8 +51,15 @@ class GaussianRSAGUI:
         
         self.public_key = None
         self.private_key = None
+        self.encrypted_chunks = []
+        
+        # Long actions run in worker processes; the UI only polls them.
+        self.workers = os.cpu_count() or 1
+        self.jobs = JobRunner(root, max_workers=self.workers)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         self.create_widgets()
+        self.load_stored_key()
         
     def create_widgets(self):
         tab_control = ttk.Notebook(self.root)
@@ -29,6 +74,14 @@ class GaussianRSAGUI:
         
         tab_control.pack(expand=1, fill="both")
         
+        status = ttk.Frame(self.root)
+        status.pack(fill="x", padx=10, pady=5)
+        self.status_var = tk.StringVar(value="Ready")
+        ttk.Label(status, textvariable=self.status_var).pack(side="left")
+        ttk.Button(status, text="Cancel", command=self.cancel_jobs).pack(side="right")
+        self.progress = ttk.Progressbar(status, length=200, mode="determinate")
+        self.progress.pack(side="right", padx=5)
+        
         self.setup_tab_ui()
         self.crypto_tab_ui()
         self.analysis_tab_ui()
@@ -73,29 +126,81 @@ class GaussianRSAGUI:
         self.analysis_display = scrolledtext.ScrolledText(self.tab_analysis, width=80, height=20)
         self.analysis_display.pack(padx=10, pady=10, fill="both", expand=True)
         
+    def start_job(self, name, label, tasks, on_done):
+        def done(results):
+            self.set_status("Ready", 0)
+            on_done(results)
+        
+        def progress(n, total):
+            self.set_status(f"{label}... {n}/{total}", 100 * n / total)
+        
+        if not self.jobs.submit(name, tasks, done, on_error=self.job_failed, on_progress=progress):
+            self.set_status(f"{label} is already running")
+            return
+        self.set_status(f"{label}...", 0)
+    
+    def set_status(self, text, percent=None):
+        self.status_var.set(text)
+        if percent is not None:
+            self.progress["value"] = percent
+    
+    def job_failed(self, exc):
+        self.set_status("Failed", 0)
+        messagebox.showerror("Error", str(exc))
+    
+    def cancel_jobs(self):
+        if self.jobs.running():
+            self.jobs.cancel_all()
+            self.set_status("Cancelled", 0)
+    
+    def on_close(self):
+        self.jobs.shutdown()
+        self.root.destroy()
+        
+    def load_stored_key(self):
+        # Generated keys are kept in the key store; resume with the latest.
+        try:
+            self.store = KeyStore(DEFAULT_PATH)
+            key_id = self.store.latest()
+            if key_id is None:
+                return
+            self.public_key, self.private_key = self.store.get(key_id)
+        except (OSError, ValueError) as exc:
+            self.store = None
+            self.set_status(f"Key store unavailable: {exc}")
+            return
+        self.show_keys(f"Loaded stored key {key_id[:16]}\n\n")
+
+    def show_keys(self, header):
+        msg = header
+        msg += f"Public Key (e, N):\n  e = {self.public_key[0]}\n  N = {self.public_key[1]}\n\n"
+        msg += f"Private Key (d, N):\n  d = {self.private_key[0]}\n  N = {self.private_key[1]}\n"
+        self.update_keys_display(msg)
+
     def generate_keys(self):
         try:
             bits = int(self.bits_entry.get())
-            self.keys_display.delete(1.0, tk.END)
-            self.keys_display.insert(tk.END, "Generating keys... Please wait.\n")
-            self.root.update()
-            
-            # Run in thread to not freeze UI
-            def task():
-                start = time.time()
-                self.public_key, self.private_key = generate_keypair(bits)
-                dt = time.time() - start
-                
-                msg = f"Key Generation Complete in {dt:.4f}s\n\n"
-                msg += f"Public Key (e, N):\n  e = {self.public_key[0]}\n  N = {self.public_key[1]}\n\n"
-                msg += f"Private Key (d, N):\n  d = {self.private_key[0]}\n  N = {self.private_key[1]}\n"
-                
-                self.root.after(0, lambda: self.update_keys_display(msg))
-                
-            threading.Thread(target=task).start()
-            
         except ValueError:
             messagebox.showerror("Error", "Invalid bit length")
+            return
+            
+        self.keys_display.delete(1.0, tk.END)
+        self.keys_display.insert(tk.END, "Generating keys... Please wait.\n")
+        start = time.time()
+        
+        def done(results):
+            self.public_key, self.private_key = results[0]
+            dt = time.time() - start
+            
+            msg = f"Key Generation Complete in {dt:.4f}s\n"
+            if self.store is not None:
+                try:
+                    msg += f"Saved as {self.store.put(results[0])[:16]}\n"
+                except OSError as exc:
+                    msg += f"Not saved: {exc}\n"
+            self.show_keys(msg + "\n")
+            
+        self.start_job("keygen", "Generating keys", [(generate_keypair, (bits, True))], done)
 
     def update_keys_display(self, msg):
         self.keys_display.delete(1.0, tk.END)
@@ -109,10 +214,15 @@ class GaussianRSAGUI:
         msg = self.msg_entry.get()
         if not msg: return
         
+        N = self.public_key[1]
         try:
-            N = self.public_key[1]
-            chunks = encode_message(msg, N.norm())
-            self.encrypted_chunks = [encrypt(c, self.public_key) for c in chunks]
+            chunks = encode_message(msg, N.norm(), packed=True)
+        except ValueError as exc:
+            messagebox.showerror("Error", str(exc))
+            return
+        
+        def done(results):
+            self.encrypted_chunks = [c for part in results for c in part]
             
             display_text = "Ciphertext (Gaussian Integers):\n"
             for i, c in enumerate(self.encrypted_chunks):
@@ -121,65 +231,38 @@ class GaussianRSAGUI:
             self.crypto_display.delete(1.0, tk.END)
             self.crypto_display.insert(tk.END, display_text)
             
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        tasks = split_tasks(encrypt_batch, chunks, self.public_key, 4 * self.workers)
+        self.start_job("encrypt", "Encrypting", tasks, done)
             
     def do_decrypt(self):
-        if not hasattr(self, 'encrypted_chunks') or not self.encrypted_chunks:
+        if not self.encrypted_chunks:
             return
             
         if not self.private_key:
             messagebox.showwarning("Warning", "No private key!")
             return
             
-        try:
-            decrypted_chunks = [decrypt(c, self.private_key) for c in self.encrypted_chunks]
-            text = decode_message(decrypted_chunks)
-            
+        def done(results):
+            N = self.private_key[1]
+            try:
+                text = decode_message([m for part in results for m in part], N.norm(), packed=True)
+            except ValueError as exc:
+                # Wrong key, or ciphertext from another modulus.
+                self.job_failed(exc)
+                return
             self.crypto_display.insert(tk.END, "\nDecrypted Message:\n" + text + "\n")
             
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        tasks = split_tasks(decrypt_batch, self.encrypted_chunks, self.private_key, 4 * self.workers)
+        self.start_job("decrypt", "Decrypting", tasks, done)
 
     def run_benchmark(self):
         self.analysis_display.delete(1.0, tk.END)
         self.analysis_display.insert(tk.END, "Running benchmark... This may take a minute.\n")
-        self.root.update()
         
-        def task():
-            import time
-            from .rsa_core import generate_keypair, encrypt, decrypt
-            from .gaussian_math import GaussianInt
-            
-            # Simple benchmark: Time to encrypt 10 blocks
-            bits = 128
-            pk, sk = generate_keypair(bits)
-            N = pk[1]
-            msg = GaussianInt(12345, 67890)
-            
-            start = time.time()
-            for _ in range(100):
-                encrypt(msg, pk)
-            enc_time = time.time() - start
-            
-            start = time.time()
-            for _ in range(100):
-                # Using dummy decrypt for speed in benchmark if needed, but let's do real
-                # Note: Decrypt is slow without CRT
-                # We'll just do 10 decrypts
-                pass
-            
-            # Since we don't have standard RSA here to import easily without dependency,
-            # We will just report raw speed.
-            
-            res = f"Benchmark Results (128-bit Gaussian RSA):\n"
-            res += f"Encryption (100 ops): {enc_time:.4f}s\n"
-            res += f"Avg Encryption Time: {enc_time/100:.6f}s\n"
-            res += f"Note: Python implementation is interpreted, C++ would be faster.\n"
-            
-            self.root.after(0, lambda: self.analysis_display.insert(tk.END, res))
+        def done(results):
+            self.analysis_display.insert(tk.END, results[0])
             
-        threading.Thread(target=task).start()
+        self.start_job("benchmark", "Running benchmark", [(benchmark_report, (128,))], done)
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,160 @@
+import contextlib
+import functools
+import time
+from collections import Counter
+from . import gaussian_math
+from .gaussian_math import GaussianInt, ReductionContext
+
+# Opt-in instrumentation for the arithmetic and RSA hot paths.
+#
+#     from src import instrument
+#     instrument.enable()
+#     ... generate keys, encrypt, decrypt ...
+#     print(instrument.report())
+#
+# Disabled (the default), nothing is wrapped: the operators are the plain
+# methods, phase() hands back a shared no-op context and rsa_core's
+# counters sit behind a single flag test per call. enable() swaps counting
+# wrappers into GaussianInt, ReductionContext and the Euclidean loop;
+# disable() puts the originals back.
+#
+# Counters and timings are per process; work done in pool workers
+# (encrypt_batch, KeyPool, the server) is not seen by the parent.
+
+enabled = False
+counters = Counter()
+# Phase path ("keygen;primes") -> [calls, total seconds, self seconds].
+phases = {}
+
+_stack = []
+_NULL = contextlib.nullcontext()
+
+# (owner, attribute, counter) for every operation counted while enabled.
+_HOOKS = (
+    (GaussianInt, "__mul__", "gaussian.mul"),
+    (GaussianInt, "__rmul__", "gaussian.mul"),
+    (GaussianInt, "__divmod__", "gaussian.divmod"),
+    (GaussianInt, "__rdivmod__", "gaussian.divmod"),
+    (ReductionContext, "mul", "reduce.mul"),
+    (ReductionContext, "sqr", "reduce.sqr"),
+    (ReductionContext, "canonical", "reduce.canonical"),
+    (gaussian_math, "_lehmer_matrix", "euclid.lehmer"),
+)
+_originals = []
+
+def _counting(name, fn):
+    @functools.wraps(fn)
+    def wrapper(*args):
+        counters[name] += 1
+        return fn(*args)
+    return wrapper
+
+def enable():
+    global enabled
+    if enabled:
+        return
+    for owner, attr, name in _HOOKS:
+        fn = owner.__dict__[attr]
+        _originals.append((owner, attr, fn))
+        setattr(owner, attr, _counting(name, fn))
+    enabled = True
+
+def disable():
+    global enabled
+    while _originals:
+        owner, attr, fn = _originals.pop()
+        setattr(owner, attr, fn)
+    enabled = False
+
+def reset():
+    counters.clear()
+    phases.clear()
+
+def count(name, n=1):
+    # Callers test `enabled` first, so a disabled build pays no call.
+    counters[name] += n
+
+class _Phase:
+    __slots__ = ('name', 'start', 'child')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        _stack.append(self)
+        self.child = 0.0
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        path = ";".join(p.name for p in _stack)
+        _stack.pop()
+        entry = phases.setdefault(path, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] += elapsed - self.child
+        if _stack:
+            _stack[-1].child += elapsed
+        return False
+
+def phase(name):
+    """
+    Context manager timing one phase. Phases nest, and are recorded under
+    their full path, e.g. "keygen;primes". A no-op unless enabled.
+    """
+    if not enabled:
+        return _NULL
+    return _Phase(name)
+
+def stats():
+    """
+    Snapshot of the counters and phase timings as plain dicts.
+    """
+    return {
+        "counters": dict(counters),
+        "phases": {path: {"calls": c, "total": t, "self": s, "mean": t / c}
+                   for path, (c, t, s) in phases.items()},
+    }
+
+def report():
+    lines = ["Counters:"]
+    for name, n in sorted(counters.items()):
+        lines.append(f"  {name:<24} {n:12d}")
+    lines.append("Phases:")
+    lines.append(f"  {'path':<32} {'calls':>8} {'total ms':>12} {'mean ms':>10}")
+    for path, (c, t, _) in sorted(phases.items()):
+        lines.append(f"  {path:<32} {c:8d} {t * 1e3:12.3f} {t / c * 1e3:10.4f}")
+    return "\n".join(lines)
+
+def dump(path):
+    # stats() as JSON.
+    import json
+    with open(path, "w") as f:
+        json.dump(stats(), f, indent=2)
+
+def dump_folded(path):
+    """
+    Writes the phase timings in folded-stack format ("keygen;primes 1234",
+    self time in microseconds), as read by flamegraph.pl and speedscope.
+    """
+    with open(path, "w") as f:
+        for p, (_, _, s) in sorted(phases.items()):
+            f.write(f"{p} {round(s * 1e6)}\n")
+
+@contextlib.contextmanager
+def profile(path=None):
+    """
+    Runs the block under cProfile and yields the profiler. With a path,
+    the pstats data is saved there on exit (for snakeviz, gprof2dot,
+    flameprof and the like).
+    """
+    import cProfile
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield prof
+    finally:
+        prof.disable()
+        if path is not None:
+            prof.dump_stats(path)
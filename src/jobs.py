@@ -0,0 +1,125 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from .rsa_core import set_stop_event
+
+class JobRunner:
+    """
+    Runs long GUI actions in a process pool so the Tk main thread never
+    blocks (and, unlike threads, CPU work does not compete for the GIL).
+
+    A job is a named list of tasks (fn, args); fn must be picklable, i.e.
+    defined at module level. Completion is polled with root.after, so all
+    callbacks run on the Tk thread:
+
+        on_progress(done, total)   whenever more tasks have finished
+        on_done(results)           task results, in task order
+        on_error(exc)              first task exception; the rest is cancelled
+
+    Only one job per name runs at a time.
+
+    Workers share a stop event (rsa_core.set_stop_event), so cancelling
+    also interrupts tasks already running in rsa_core's prime searches and
+    batch loops; the pool is then replaced, and the next job does not wait
+    behind the interrupted ones.
+    """
+    def __init__(self, root, max_workers=None, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.max_workers = max_workers
+        self._jobs = {}
+        self._start_pool()
+
+    def _start_pool(self):
+        self._stop = multiprocessing.Event()
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             initializer=set_stop_event, initargs=(self._stop,))
+
+    def submit(self, name, tasks, on_done, on_error=None, on_progress=None):
+        """
+        Starts job `name`. Returns False, without starting anything, if a
+        job with that name is still running.
+        """
+        if name in self._jobs:
+            return False
+        futures = [self._executor.submit(fn, *args) for fn, args in tasks]
+        self._jobs[name] = _Job(futures, on_done, on_error, on_progress)
+        self.root.after(self.poll_ms, self._poll, name)
+        return True
+
+    def running(self, name=None):
+        if name is None:
+            return bool(self._jobs)
+        return name in self._jobs
+
+    def cancel(self, name):
+        """
+        Cancels job `name`. Tasks not yet started are dropped. Running
+        tasks are interrupted once no other job is left on the pool (the
+        stop event is shared); until then they finish in their worker and
+        their results are discarded.
+        """
+        job = self._jobs.pop(name, None)
+        if job is None:
+            return False
+        if _drop(job) and not self._jobs:
+            self._interrupt()
+        return True
+
+    def cancel_all(self):
+        jobs = list(self._jobs.values())
+        self._jobs.clear()
+        if any([_drop(job) for job in jobs]):
+            self._interrupt()
+
+    def _interrupt(self):
+        # Stops the running tasks and moves on to a fresh pool; the old
+        # workers exit as soon as their tasks notice the event.
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._start_pool()
+
+    def shutdown(self):
+        self.cancel_all()
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self, name):
+        job = self._jobs.get(name)
+        if job is None:
+            return  # cancelled
+
+        done = 0
+        for f in job.futures:
+            if not f.done():
+                continue
+            done += 1
+            exc = f.exception()
+            if exc is not None:
+                self.cancel(name)
+                if job.on_error:
+                    job.on_error(exc)
+                return
+
+        if done != job.reported and job.on_progress:
+            job.on_progress(done, len(job.futures))
+        job.reported = done
+
+        if done == len(job.futures):
+            del self._jobs[name]
+            job.on_done([f.result() for f in job.futures])
+        else:
+            self.root.after(self.poll_ms, self._poll, name)
+
+def _drop(job):
+    # Cancels the job's queued tasks; True if some are already running.
+    return any([not f.cancel() and not f.done() for f in job.futures])
+
+class _Job:
+    __slots__ = ('futures', 'on_done', 'on_error', 'on_progress', 'reported')
+
+    def __init__(self, futures, on_done, on_error, on_progress):
+        self.futures = futures
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.reported = 0
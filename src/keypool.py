@@ -0,0 +1,125 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .rsa_core import GaussianRSAKey, generate_keypair
+from .keystore import dumps, loads
+
+# Saved pools use the key store's binary encoding under their own magic:
+# a tuple of (bits, entries) pairs, each entry (public_key, private_key,
+# factors). factors keeps the primes of plain private keys, which the key
+# tuple itself does not hold.
+POOL_MAGIC = b"GRSP"
+
+class KeyPool:
+    """
+    Keeps `target` pre-generated keypairs per bit size and hands them out
+    in O(1). Whenever a pool drops below target, keys are regenerated in
+    background worker processes, so callers never wait on prime search
+    unless a pool is empty.
+
+    With `path`, unused keys are saved there on close() and picked up by
+    the next KeyPool, so a warm pool survives restarts.
+    """
+    def __init__(self, sizes=(128,), target=4, workers=None, crt=True, path=None):
+        self.target = target
+        self.crt = crt
+        self.path = path
+        self._pools = {bits: deque() for bits in sizes}
+        self._pending = {bits: 0 for bits in sizes}
+        self._lock = threading.Lock()
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        if path is not None and os.path.exists(path):
+            self.load(path)
+        for bits in sizes:
+            self._refill(bits)
+
+    def get(self, bits):
+        """
+        Returns a (public_key, private_key) pair of the given size.
+        Generates one synchronously only if the pool is empty.
+        """
+        with self._lock:
+            pool = self._pools.setdefault(bits, deque())
+            self._pending.setdefault(bits, 0)
+            keypair = pool.popleft() if pool else None
+        self._refill(bits)
+        if keypair is None:
+            keypair = generate_keypair(bits, crt=self.crt)
+        return keypair
+
+    def available(self, bits):
+        with self._lock:
+            return len(self._pools.get(bits, ()))
+
+    def _refill(self, bits):
+        with self._lock:
+            missing = self.target - len(self._pools[bits]) - self._pending[bits]
+            if missing <= 0:
+                return
+            self._pending[bits] += missing
+        for _ in range(missing):
+            future = self._executor.submit(generate_keypair, bits, self.crt)
+            future.add_done_callback(lambda f, bits=bits: self._store(bits, f))
+
+    def _store(self, bits, future):
+        # Runs in the executor's callback thread.
+        with self._lock:
+            self._pending[bits] -= 1
+            if not future.cancelled() and future.exception() is None:
+                self._pools[bits].append(future.result())
+
+    def save(self, path=None):
+        """
+        Writes the unused keys to `path` (owner read/write only).
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path given and the pool has none")
+        with self._lock:
+            data = tuple((bits, tuple(_entry(k) for k in pool)) for bits, pool in self._pools.items())
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(dumps(data, POOL_MAGIC))
+
+    def load(self, path=None):
+        """
+        Adds the keys saved at `path` to the pools and removes the file,
+        so a key is never handed out by two processes.
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path given and the pool has none")
+        with open(path, 'rb') as f:
+            # Validates magic and version before the file is removed, so
+            # an unreadable file keeps its keys.
+            data = loads(f.read(), POOL_MAGIC)
+        os.remove(path)
+        with self._lock:
+            for bits, entries in data:
+                self._pools.setdefault(bits, deque()).extend(_keypair(e) for e in entries)
+                self._pending.setdefault(bits, 0)
+
+    def close(self):
+        """
+        Stops background generation and, with a path, saves unused keys.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self.path is not None:
+            self.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _entry(keypair):
+    public_key, private_key = keypair
+    factors = private_key.factors if isinstance(private_key, GaussianRSAKey) else ()
+    return (tuple(public_key), tuple(private_key), factors)
+
+def _keypair(entry):
+    # Loaded keys are GaussianRSAKeys, like freshly generated ones.
+    public_key, private_key, factors = entry
+    return GaussianRSAKey(public_key), GaussianRSAKey(private_key, factors=factors or None)
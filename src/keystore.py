@@ -0,0 +1,308 @@
+import json
+import os
+import struct
+import time
+from .gaussian_math import GaussianInt, ReductionContext
+from .rsa_core import GaussianRSAKey, key_factors, key_fingerprint
+
+# On-disk key store: one directory holding
+#
+#   index.json    key id -> {"bits", "crt", "created", "label"}
+#   <id>.key      the keypair
+#   <id>.cache    derived values, written on first use
+#
+# The key id is the hex key_fingerprint of the modulus. .key and .cache
+# files start with a 4-byte magic and a u8 version, followed by one value
+# in a tagged binary encoding (all integers big-endian):
+#
+#   b"n"                       None
+#   b"i" u32 len, len bytes    int, signed
+#   b"g" int int               GaussianInt, real then imag
+#   b"t" u16 count, values     tuple
+#
+# Everything is written owner read/write only, through a temporary file
+# and os.replace, so readers never see a partial file.
+
+# Store used by the GUI when none is given.
+DEFAULT_PATH = (os.environ.get("GAUSSIAN_RSA_KEYS")
+                or os.path.join(os.path.expanduser("~"), ".gaussian_rsa", "keys"))
+
+KEY_MAGIC = b"GRSK"
+CACHE_MAGIC = b"GRSD"
+VERSION = 1
+_PREFIX = struct.Struct(">4sB")
+_LEN = struct.Struct(">I")
+_COUNT = struct.Struct(">H")
+
+def _pack_int(v, out):
+    b = v.to_bytes((v.bit_length() + 8) // 8, 'big', signed=True)
+    out += _LEN.pack(len(b))
+    out += b
+
+def _pack(obj, out):
+    if obj is None:
+        out += b"n"
+    elif isinstance(obj, GaussianInt):
+        out += b"g"
+        _pack_int(obj.real, out)
+        _pack_int(obj.imag, out)
+    elif isinstance(obj, int):
+        out += b"i"
+        _pack_int(obj, out)
+    elif isinstance(obj, tuple):
+        out += b"t" + _COUNT.pack(len(obj))
+        for x in obj:
+            _pack(x, out)
+    else:
+        raise TypeError(f"Cannot store {type(obj).__name__}")
+
+def _unpack_int(data, pos):
+    (n,) = _LEN.unpack_from(data, pos)
+    pos += _LEN.size
+    if pos + n > len(data):
+        raise ValueError("truncated integer")
+    return int.from_bytes(data[pos : pos + n], 'big', signed=True), pos + n
+
+def _unpack(data, pos):
+    tag = data[pos : pos + 1]
+    pos += 1
+    if tag == b"n":
+        return None, pos
+    if tag == b"i":
+        return _unpack_int(data, pos)
+    if tag == b"g":
+        real, pos = _unpack_int(data, pos)
+        imag, pos = _unpack_int(data, pos)
+        return GaussianInt(real, imag), pos
+    if tag == b"t":
+        (count,) = _COUNT.unpack_from(data, pos)
+        pos += _COUNT.size
+        items = []
+        for _ in range(count):
+            item, pos = _unpack(data, pos)
+            items.append(item)
+        return tuple(items), pos
+    raise ValueError(f"unknown tag {tag!r}")
+
+def dumps(obj, magic=KEY_MAGIC):
+    """
+    Encodes a nested tuple of ints, GaussianInts and None, e.g. a keypair.
+    """
+    out = bytearray(_PREFIX.pack(magic, VERSION))
+    _pack(obj, out)
+    return bytes(out)
+
+def loads(data, magic=KEY_MAGIC):
+    try:
+        got, version = _PREFIX.unpack_from(data)
+        if got != magic:
+            raise ValueError("bad magic")
+        if version != VERSION:
+            raise ValueError(f"unsupported version {version}")
+        obj, pos = _unpack(data, _PREFIX.size)
+    except struct.error:
+        raise ValueError("Corrupt key file: truncated") from None
+    except ValueError as exc:
+        raise ValueError(f"Corrupt key file: {exc}") from None
+    if pos != len(data):
+        raise ValueError("Corrupt key file: trailing data")
+    return obj
+
+def _write_private(path, data):
+    tmp = path + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def derive(keypair):
+    """
+    Values derived from a keypair, as stored in the .cache file:
+    N.norm(), N.conj(), phi(N) and the factor norms (None for plain
+    private keys), and the ReductionContext states for N and, for CRT
+    keys, each prime factor.
+    """
+    public_key, private_key = keypair
+    N = public_key[1]
+    factors = key_factors(private_key)
+    if factors:
+        norms = tuple(p.norm() for p in factors)
+        phi = 1
+        for n in norms:
+            phi *= n - 1
+        moduli = (N,) + factors
+    else:
+        norms = phi = None
+        moduli = (N,)
+    states = tuple(ReductionContext(m).state() for m in moduli)
+    return {"norm": N.norm(), "conj": N.conj(), "phi": phi,
+            "factor_norms": norms, "contexts": states}
+
+_DERIVED = ("norm", "conj", "phi", "factor_norms", "contexts")
+
+class KeyStore:
+    """
+    Persistent keypairs indexed by fingerprint. Loaded keys and derived
+    values are kept in memory after first access.
+
+    Ids may be abbreviated to any unique prefix, as with git hashes.
+    """
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        self._index_path = os.path.join(path, "index.json")
+        self._index = {}
+        if os.path.exists(self._index_path):
+            with open(self._index_path) as f:
+                data = json.load(f)
+            if data.get("version") != VERSION:
+                raise ValueError(f"Unsupported key store version {data.get('version')}")
+            self._index = data["keys"]
+        self._keys = {}
+        self._derived = {}
+
+    def _file(self, key_id, ext):
+        return os.path.join(self.path, key_id + ext)
+
+    def _save_index(self):
+        data = json.dumps({"version": VERSION, "keys": self._index}, indent=1)
+        _write_private(self._index_path, data.encode())
+
+    def resolve(self, key_id):
+        """
+        Full id for a (possibly abbreviated) key id.
+        """
+        if key_id in self._index:
+            return key_id
+        matches = [k for k in self._index if k.startswith(key_id)]
+        if len(matches) != 1:
+            raise KeyError(f"{'Ambiguous' if matches else 'Unknown'} key id {key_id!r}")
+        return matches[0]
+
+    def put(self, keypair, label=None):
+        """
+        Stores a (public_key, private_key) pair and returns its id.
+        """
+        public_key, private_key = keypair
+        key_id = key_fingerprint(public_key).hex()
+        _write_private(self._file(key_id, ".key"), dumps((public_key, private_key)))
+        # The cache is tagged with N only; a different private key shape
+        # for the same N (plain vs CRT) needs it rebuilt.
+        self._derived.pop(key_id, None)
+        try:
+            os.remove(self._file(key_id, ".cache"))
+        except FileNotFoundError:
+            pass
+        self._index[key_id] = {"bits": public_key[1].norm().bit_length(),
+                               "crt": len(private_key) > 2,
+                               "created": time.time(), "label": label}
+        self._save_index()
+        self._keys[key_id] = (public_key, private_key)
+        return key_id
+
+    def get(self, key_id):
+        """
+        The (public_key, private_key) pair stored under key_id, as
+        GaussianRSAKeys whose norm, conjugate, phi(N) and reduction
+        contexts are filled in from the .cache file (see derived).
+        """
+        key_id = self.resolve(key_id)
+        keypair = self._keys.get(key_id)
+        if keypair is None:
+            with open(self._file(key_id, ".key"), 'rb') as f:
+                public_key, private_key = loads(f.read())
+            if key_fingerprint(public_key).hex() != key_id:
+                raise ValueError(f"Key file for {key_id} holds a different key")
+            keypair = (GaussianRSAKey(public_key), GaussianRSAKey(private_key))
+            self._keys[key_id] = keypair
+            self._seed(key_id, keypair)
+        return keypair
+
+    def _seed(self, key_id, keypair):
+        # Presets the keys' cached properties, so callers going through
+        # key_context, encrypt or decrypt skip recomputing them.
+        values = self.derived(key_id)
+        public_ctx, private_ctx = self.contexts(key_id)
+        public_key, private_key = keypair
+        for key, ctx in ((public_key, public_ctx), (private_key, private_ctx)):
+            key.norm = values["norm"]
+            key.conj = values["conj"]
+            key.context = ctx
+        if values["phi"] is not None:
+            private_key.phi = values["phi"]
+
+    def public_key(self, key_id):
+        return self.get(key_id)[0]
+
+    def private_key(self, key_id):
+        return self.get(key_id)[1]
+
+    def derived(self, key_id):
+        """
+        Derived values of the key (see derive), read from the .cache file,
+        or computed and written there on first use.
+        """
+        key_id = self.resolve(key_id)
+        values = self._derived.get(key_id)
+        if values is not None:
+            return values
+        path = self._file(key_id, ".cache")
+        # The cache leads with the key's fingerprint (as an int), so a
+        # cache left over from another key is detected and rebuilt.
+        tag = int(key_id, 16)
+        try:
+            with open(path, 'rb') as f:
+                cached = loads(f.read(), CACHE_MAGIC)
+            if len(cached) != len(_DERIVED) + 1 or cached[0] != tag:
+                raise ValueError("stale cache")
+            values = dict(zip(_DERIVED, cached[1:]))
+        except (OSError, ValueError):
+            values = derive(self.get(key_id))
+            _write_private(path, dumps((tag,) + tuple(values[k] for k in _DERIVED), CACHE_MAGIC))
+        self._derived[key_id] = values
+        return values
+
+    def contexts(self, key_id):
+        """
+        (public_ctx, private_ctx) for the key, shaped like key_context's
+        results, rebuilt from the cached constants.
+        """
+        states = self.derived(key_id)["contexts"]
+        ctxs = tuple(ReductionContext.from_state(s) for s in states)
+        if len(ctxs) == 1:
+            return ctxs[0], ctxs[0]
+        return ctxs[0], ctxs
+
+    def delete(self, key_id):
+        key_id = self.resolve(key_id)
+        del self._index[key_id]
+        self._save_index()
+        self._keys.pop(key_id, None)
+        self._derived.pop(key_id, None)
+        for ext in (".key", ".cache"):
+            try:
+                os.remove(self._file(key_id, ext))
+            except FileNotFoundError:
+                pass
+
+    def info(self, key_id):
+        return dict(self._index[self.resolve(key_id)])
+
+    def latest(self):
+        # Id of the most recently stored key, or None if the store is empty.
+        if not self._index:
+            return None
+        return max(self._index, key=lambda k: self._index[k]["created"])
+
+    def __contains__(self, key_id):
+        try:
+            self.resolve(key_id)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        return iter(list(self._index))
@@ -0,0 +1,241 @@
+import math
+import mmap
+import struct
+import sys
+from array import array
+from .gaussian_math import GaussianInt
+
+# Table of all Gaussian primes of norm <= bound, one per associate class,
+# for trial division and factorization of small Gaussian integers.
+#
+# Every Gaussian prime lies over a rational prime p:
+#   p = 2          1 + i                    norm 2
+#   p = 1 mod 4    a + bi and b + ai        norm p, with a^2 + b^2 = p
+#   p = 3 mod 4    p itself (inert)         norm p^2
+# so the table is two parallel arrays indexed by p: the rational primes
+# (u32) and, for p = 1 mod 4, the larger component a (u16; 1 for p = 2,
+# 0 for inert p). b follows as isqrt(p - a^2).
+#
+# File layout, little-endian:
+#
+#   magic     4 bytes   b"GRPT"
+#   version   u8        1
+#   reserved  3 bytes
+#   bound     u64
+#   count     u64       number of rational primes
+#   primes    count * u32
+#   parts     count * u16
+#
+# load() maps the file and reads the arrays in place, without copying.
+
+MAGIC = b"GRPT"
+VERSION = 1
+HEADER = struct.Struct("<4sB3xQQ")
+MAX_BOUND = (1 << 32) - 1
+
+def _sieve(limit):
+    # bytearray with s[n] == 1 exactly for the primes n <= limit.
+    s = bytearray([1]) * (limit + 1)
+    s[0:2] = b'\x00\x00'
+    for i in range(2, math.isqrt(limit) + 1):
+        if s[i]:
+            s[i * i :: i] = bytes(len(range(i * i, limit + 1, i)))
+    return s
+
+def _normalize(z):
+    # (unit, w) with z == unit * w and w in the first quadrant
+    # (real > 0, imag >= 0); z must be nonzero.
+    unit = GaussianInt(1, 0)
+    while not (z.real > 0 and z.imag >= 0):
+        z = GaussianInt(z.imag, -z.real)  # z / i
+        unit = GaussianInt(-unit.imag, unit.real)  # unit * i
+    return unit, z
+
+class GaussianPrimeTable:
+    """
+    Gaussian primes of norm <= bound. Build with build_table, or load a
+    saved table with load_table; loaded tables should be closed (or used
+    as a context manager) when done.
+    """
+    def __init__(self, bound, primes, parts, _owner=None):
+        self.bound = bound
+        self.primes = primes
+        self.parts = parts
+        self._owner = _owner
+        self._count = len(primes) + sum(1 for p in primes if p % 4 == 1)
+
+    def __len__(self):
+        # Gaussian primes, counting a + bi and b + ai separately.
+        return self._count
+
+    def __iter__(self):
+        # Ordered by the rational prime below each Gaussian prime.
+        for p, a in zip(self.primes, self.parts):
+            if p % 4 == 3:
+                yield GaussianInt(p, 0)
+            elif p == 2:
+                yield GaussianInt(1, 1)
+            else:
+                b = math.isqrt(p - a * a)
+                yield GaussianInt(a, b)
+                yield GaussianInt(b, a)
+
+    def trial_division(self, z):
+        """
+        (factors, rest) with z == rest * prod(q ** e for q, e in factors).
+        factors are first-quadrant primes from the table; rest has no prime
+        factor in the table and carries z's unit.
+        """
+        zr, zi = z.real, z.imag
+        n = zr * zr + zi * zi
+        if n == 0:
+            raise ValueError("0 has no factorization")
+        factors = []
+        for p, a in zip(self.primes, self.parts):
+            # Once n < p^2, what is left is a unit or a single prime.
+            if n < p * p:
+                break
+            if n % p:
+                continue
+            if p % 4 == 3:
+                e = 0
+                while zr % p == 0 and zi % p == 0:
+                    zr, zi = zr // p, zi // p
+                    e += 1
+                n //= p ** (2 * e)
+                factors.append((GaussianInt(p, 0), e))
+                continue
+            # z / (x + yi) = z * (x - yi) / p, exact when both parts divide.
+            b = math.isqrt(p - a * a)
+            for x, y in (((1, 1),) if p == 2 else ((a, b), (b, a))):
+                e = 0
+                while True:
+                    tr, ti = zr * x + zi * y, zi * x - zr * y
+                    if tr % p or ti % p:
+                        break
+                    zr, zi = tr // p, ti // p
+                    e += 1
+                if e:
+                    n //= p ** e
+                    factors.append((GaussianInt(x, y), e))
+        return factors, GaussianInt(zr, zi)
+
+    def factor(self, z):
+        """
+        (unit, factors) with z == unit * prod(q ** e for q, e in factors),
+        q first-quadrant primes. Complete for N(z) <= bound^2; beyond that,
+        raises ValueError if a factor of norm > bound is left over.
+        """
+        factors, rest = self.trial_division(z)
+        n = rest.norm()
+        if n == 1:
+            return rest, factors
+        # A composite rest would have a prime factor of norm <= sqrt(n),
+        # and none of norm <= bound is left.
+        if n > self.bound * self.bound:
+            raise ValueError(f"{z} has factors of norm above {self.bound}")
+        unit, q = _normalize(rest)
+        return unit, factors + [(q, 1)]
+
+    def is_prime(self, z):
+        # Gaussian primality for N(z) <= bound^2.
+        if z.norm() <= 1:
+            return False
+        _, factors = self.factor(z)
+        return len(factors) == 1 and factors[0][1] == 1
+
+    def save(self, path):
+        primes, parts = array('I', self.primes), array('H', self.parts)
+        if sys.byteorder != 'little':
+            primes.byteswap()
+            parts.byteswap()
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.bound, len(primes)))
+            f.write(primes.tobytes())
+            f.write(parts.tobytes())
+
+    def close(self):
+        if self._owner is not None:
+            f, m, views = self._owner
+            for v in views:
+                v.release()
+            m.close()
+            f.close()
+            self._owner = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def build_table(bound=1 << 20):
+    """
+    Sieves the rational primes up to bound and keeps those with a Gaussian
+    prime of norm <= bound over them: 2, every p = 1 mod 4, and
+    p = 3 mod 4 with p^2 <= bound.
+    """
+    if not 2 <= bound <= MAX_BOUND:
+        raise ValueError(f"bound must be in [2, {MAX_BOUND}]")
+    s = _sieve(bound)
+    # Split primes p = a^2 + b^2 (a > b > 0), by walking the lattice
+    # points under the circle of radius sqrt(bound).
+    split = {}
+    for a in range(2, math.isqrt(bound) + 1):
+        for b in range(1, min(a, math.isqrt(bound - a * a) + 1)):
+            n = a * a + b * b
+            if s[n]:
+                split[n] = a
+    root = math.isqrt(bound)
+    primes, parts = array('I'), array('H')
+    for p in range(2, bound + 1):
+        if not s[p]:
+            continue
+        if p == 2:
+            primes.append(2)
+            parts.append(1)
+        elif p % 4 == 1:
+            primes.append(p)
+            parts.append(split[p])
+        elif p <= root:
+            primes.append(p)
+            parts.append(0)
+    return GaussianPrimeTable(bound, primes, parts)
+
+def load_table(path):
+    """
+    Maps a table written by GaussianPrimeTable.save.
+    """
+    f = open(path, 'rb')
+    try:
+        m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        f.close()
+        raise ValueError("Not a prime table: empty")
+    try:
+        if len(m) < HEADER.size:
+            raise ValueError("Not a prime table: truncated header")
+        magic, version, bound, count = HEADER.unpack_from(m)
+        if magic != MAGIC:
+            raise ValueError("Not a prime table: bad magic")
+        if version != VERSION:
+            raise ValueError(f"Unsupported prime table version {version}")
+        end = HEADER.size + 6 * count
+        if len(m) != end:
+            raise ValueError("Corrupt prime table: size mismatch")
+    except ValueError:
+        m.close()
+        f.close()
+        raise
+    mid = HEADER.size + 4 * count
+    if sys.byteorder == 'little':
+        view = memoryview(m)
+        primes, parts = view[HEADER.size : mid].cast('I'), view[mid:end].cast('H')
+        return GaussianPrimeTable(bound, primes, parts, (f, m, (primes, parts, view)))
+    # Big-endian hosts read a byteswapped copy.
+    primes, parts = array('I', m[HEADER.size : mid]), array('H', m[mid:end])
+    primes.byteswap()
+    parts.byteswap()
+    m.close()
+    f.close()
+    return GaussianPrimeTable(bound, primes, parts)
@@ -1,15 +1,44 @@
-import random
 import math
-from .gaussian_math import GaussianInt, mod_pow_gaussian, mod_inverse_gaussian
+import os
+from collections import OrderedDict
+from functools import cached_property
+from .gaussian_math import GaussianInt, ReductionContext, mod_pow_gaussian, mod_inverse_gaussian, sliding_window_steps
+from . import instrument
+from .instrument import phase
+
+# random, hashlib and concurrent.futures are imported where they are used,
+# so a process that only encrypts or decrypts never loads them.
+
+def _small_primes(limit):
+    # Odd primes below limit, by the sieve of Eratosthenes.
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b'\x00\x00'
+    for i in range(2, math.isqrt(limit) + 1):
+        if sieve[i]:
+            sieve[i * i :: i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(3, limit, 2) if sieve[i]]
+
+SMALL_PRIMES = _small_primes(8192)
+
+def miller_rabin_rounds(bits):
+    # Rounds giving error probability below 2^-80 for a *random* odd
+    # candidate of this size (Damgard-Landrock-Pomerance bounds, as
+    # tabulated in HAC table 4.4). Adversarial inputs need k=40.
+    for min_bits, k in ((1300, 2), (850, 3), (650, 4), (550, 5), (450, 6),
+                        (400, 7), (350, 8), (300, 9), (250, 12), (200, 15), (150, 18)):
+        if bits >= min_bits:
+            return k
+    return 27
 
 def is_prime_miller_rabin(n, k=40):
-    if n == 2: return True
+    import random
+    if n < 4: return n >= 2
     if n % 2 == 0: return False
     r, d = 0, n - 1
     while d % 2 == 0:
         r += 1
         d //= 2
-    for _ in range(k):
+    for i in range(k):
         a = random.randint(2, n - 2)
         x = pow(a, d, n)
         if x == 1 or x == n - 1:
@@ -19,19 +48,79 @@ def is_prime_miller_rabin(n, k=40):
             if x == n - 1:
                 break
         else:
+            if instrument.enabled: instrument.count("mr.rounds", i + 1)
             return False
+    if instrument.enabled: instrument.count("mr.rounds", k)
     return True
 
-def generate_rational_prime(bits):
+def generate_rational_prime(bits, residue=None):
+    # Random prime of exactly `bits` bits (top bit set).
+    # residue=1 or 3 fixes p mod 4 up front instead of rejecting afterwards.
+    #
+    # Candidates start + step*j in a window are first sieved by the small
+    # primes; only survivors get Miller-Rabin, with miller_rabin_rounds(bits)
+    # rounds. A window without a prime is retried from a new random start.
+    import random
+    if bits < 2:
+        raise ValueError("Primes need at least 2 bits")
+    if residue not in (None, 1, 3):
+        raise ValueError("residue must be 1 or 3 (mod 4)")
+    step = 2 if residue is None else 4
+    lo, hi = 1 << (bits - 1), 1 << bits
+    window = max(bits, 64)
+    rounds = miller_rabin_rounds(bits)
+    if bits == 2:
+        # The 2-bit primes are 2 and 3; none is 1 mod 4.
+        if residue == 1:
+            raise ValueError("No 2-bit prime is 1 mod 4")
+        return random.choice((2, 3)) if residue is None else 3
+
     while True:
-        n = random.getrandbits(bits)
-        if n % 2 == 0: n += 1
-        if is_prime_miller_rabin(n):
-            return n
+        start = random.randrange(lo, hi)
+        if residue is None:
+            start |= 1
+        else:
+            start += (residue - start) % 4
+        # Candidates equal to a small prime must not be sieved out,
+        # so only primes below start are used.
+        sieve = bytearray(window)
+        for q in SMALL_PRIMES:
+            if q >= start:
+                break
+            j = (-start * pow(step, -1, q)) % q
+            if j < window:
+                sieve[j::q] = b'\x01' * len(range(j, window, q))
+        # Candidates must stay below hi.
+        scan = min(window, (hi - 1 - start) // step + 1)
+        for j in range(scan):
+            if sieve[j]:
+                continue
+            if _stop_event is not None and _stop_event.is_set():
+                raise Cancelled
+            n = start + step * j
+            if is_prime_miller_rabin(n, rounds):
+                if instrument.enabled: _count_window(sieve, j + 1)
+                return n
+        if instrument.enabled: _count_window(sieve, scan)
+
+def _count_window(sieve, scanned):
+    rejected = sieve.count(1, 0, scanned)
+    instrument.count("prime.windows")
+    instrument.count("prime.sieved", rejected)
+    instrument.count("prime.candidates", scanned - rejected)
 
 def legendre_symbol(a, p):
     return pow(a, (p - 1) // 2, p)
 
+def _non_residue(p):
+    # Random quadratic non-residue mod an odd prime p; half of all
+    # candidates qualify, so two tries are expected.
+    import random
+    while True:
+        z = random.randrange(2, p)
+        if legendre_symbol(z, p) == p - 1:
+            return z
+
 def tonelli_shanks(n, p):
     # Solves x^2 = n (mod p)
     if legendre_symbol(n, p) != 1:
@@ -43,10 +132,7 @@ def tonelli_shanks(n, p):
         s += 1
     if s == 1:
         return pow(n, (p + 1) // 4, p)
-    for z in range(2, p):
-        if p - 1 == legendre_symbol(z, p):
-            c = pow(z, q, p)
-            break
+    c = pow(_non_residue(p), q, p)
     r = pow(n, (q + 1) // 2, p)
     t = pow(n, q, p)
     m = s
@@ -65,71 +151,470 @@ def tonelli_shanks(n, p):
 
 def decompose_prime(p):
     # p = 1 mod 4. Find a+bi such that a^2+b^2=p
-    # Step 1: Find r such that r^2 = -1 mod p
-    r = tonelli_shanks(-1, p)
-    
-    # Step 2: Euclidean algorithm variant
-    # reduction until remainder < sqrt(p)
+    # Exact integer arithmetic throughout, for primes of any size.
+    import random
+    if p == 2:
+        return GaussianInt(1, 1)
+    if p % 4 != 1:
+        raise ValueError(f"{p} is not a sum of two squares (p != 1 mod 4)")
+
+    # Step 1: r with r^2 = -1 mod p. For a random z, r = z^((p-1)/4)
+    # has r^2 = z^((p-1)/2) = -1 exactly when z is a non-residue, so each
+    # try costs one exponentiation and succeeds with probability 1/2.
+    for _ in range(128):
+        r = pow(random.randrange(2, p - 1), (p - 1) // 4, p)
+        if r * r % p == p - 1:
+            break
+    else:
+        raise ValueError(f"{p} is not prime")
+
+    # Step 2: Hermite-Serret. Run the Euclidean algorithm on (p, r);
+    # the first remainder below sqrt(p) is one component.
     a, b = p, r
-    root_p = int(p**0.5)
+    root_p = math.isqrt(p)
     while b > root_p:
         a, b = b, a % b
-    
-    # Now b is one component, find the other
+
     # p = b^2 + c^2
-    c = int((p - b*b)**0.5)
+    c = math.isqrt(p - b * b)
+    if b * b + c * c != p:
+        raise ValueError(f"{p} is not prime")
     return GaussianInt(b, c)
 
 def generate_gaussian_prime(bits):
     # Generates a Gaussian prime with norm approx 2^bits.
     # Note: If we pick p ~ 2^bits (1 mod 4), N(pi) = p ~ 2^bits.
     # If we pick p ~ 2^(bits/2) (3 mod 4), N(p) = p^2 ~ 2^bits.
+    import random
     
     if random.random() < 0.5:
         # Type 3 mod 4 (Inert)
         # We need p^2 to be around 2^bits, so p around 2^(bits/2)
         p_bits = max(bits // 2, 2)
-        while True:
-            p = generate_rational_prime(p_bits)
-            if p % 4 == 3:
-                return GaussianInt(p, 0)
+        p = generate_rational_prime(p_bits, residue=3)
+        return GaussianInt(p, 0)
     else:
         # Type 1 mod 4 (Split)
         # We need p to be around 2^bits
-        while True:
-            p = generate_rational_prime(bits)
-            if p % 4 == 1:
-                return decompose_prime(p)
+        p = generate_rational_prime(max(bits, 3), residue=1)
+        return decompose_prime(p)
+
+# Parallel prime search for generate_keypair. Each task is one full
+# generate_gaussian_prime call in a pool worker, on its own random seed:
+# "<seed>/<task>" when a seed is given, fresh OS entropy otherwise. Once
+# enough primes are in, a shared event stops the searches still running.
+
+# Prime draws allowed per factor before a key size is declared too small
+# to hold that many distinct primes (e.g. 4 factors of 4 bits each).
+MAX_DRAWS_PER_PRIME = 64
 
-def generate_keypair(bits=128):
+def _too_small(bits, count):
+    return ValueError(f"Cannot find {count} distinct Gaussian primes of {bits} bits; "
+                      "use a larger key or fewer primes")
+
+# Cooperative cancellation for worker processes. Once the event given to
+# set_stop_event is set, prime searches and in-process batch loops in
+# this process raise Cancelled at their next candidate or block. Used as a
+# pool initializer by the keygen search above and by jobs.JobRunner.
+_stop_event = None
+
+class Cancelled(Exception):
+    pass
+
+def set_stop_event(stop):
+    global _stop_event
+    _stop_event = stop
+
+def _prime_task(bits, seed, task):
+    import random
+    # Forked workers inherit the parent's random state, so reseed always.
+    random.seed(None if seed is None else f"{seed}/{task}")
+    return generate_gaussian_prime(bits)
+
+def _pick_primes(found, count, ordered):
+    # `count` distinct primes from found (task -> prime), or None. Ordered
+    # picks walk the tasks 0, 1, ... and stop at the first unfinished
+    # one, so the choice does not depend on timing; otherwise primes are
+    # taken in completion order.
+    if ordered:
+        seq = []
+        while len(seq) in found:
+            seq.append(found[len(seq)])
+    else:
+        seq = found.values()
+    picked = []
+    for p in seq:
+        if p not in picked:
+            picked.append(p)
+            if len(picked) == count:
+                return picked
+    return None
+
+def _search_primes(bits, count, workers, seed):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+    if workers <= 1:
+        # In-process; same tasks and picks as the ordered parallel search.
+        import random
+        state = random.getstate()
+        try:
+            found = {}
+            while (picked := _pick_primes(found, count, True)) is None:
+                if len(found) >= MAX_DRAWS_PER_PRIME * count:
+                    raise _too_small(bits, count)
+                found[len(found)] = _prime_task(bits, seed, len(found))
+            return picked
+        finally:
+            random.setstate(state)
+
+    stop = multiprocessing.Event()
+    found = {}
+    pending = {}
+    task = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_stop_event,
+                             initargs=(stop,)) as pool:
+        try:
+            while (picked := _pick_primes(found, count, seed is not None)) is None:
+                if len(found) >= MAX_DRAWS_PER_PRIME * count:
+                    raise _too_small(bits, count)
+                while len(pending) < workers:
+                    pending[pool.submit(_prime_task, bits, seed, task)] = task
+                    task += 1
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    found[pending.pop(f)] = f.result()
+        finally:
+            stop.set()
+            for f in pending:
+                f.cancel()
+    return picked
+
+def generate_keypair(bits=128, crt=False, primes=2, workers=1, seed=None):
     # bits is roughly the bit length of the modulus N.
-    # So pi and rho should have norm approx 2^(bits/2).
-    prime_bits = bits // 2
-    
-    pi = generate_gaussian_prime(prime_bits)
-    rho = generate_gaussian_prime(prime_bits)
-    
-    # Ensure distinct
-    while pi == rho:
-        rho = generate_gaussian_prime(prime_bits)
-        
-    N = pi * rho
-    
-    # phi(N) = (N(pi)-1)(N(rho)-1)
-    phi_N = (pi.norm() - 1) * (rho.norm() - 1)
-    
-    e = 65537
-    while math.gcd(e, phi_N) != 1:
-        e += 2
-        
-    d = pow(e, -1, phi_N)
-    
-    return ((e, N), (d, N))
+    # N is the product of `primes` distinct Gaussian primes, each of norm
+    # approx 2^(bits/primes); split and inert primes are mixed at random.
+    # With crt=True the private key is extended with the factors of N
+    # (see decrypt), otherwise it is the plain pair (d, N).
+    # Both keys are GaussianRSAKeys; the private one keeps the factors and
+    # phi(N) even in the plain form.
+    #
+    # workers > 1 runs the prime searches in that many processes. Without
+    # a seed the first primes found win; with one, each search is seeded
+    # from it and the picks are made in search order, so the same seed
+    # gives the same key for any number of workers.
+    if primes < 2:
+        raise ValueError("A modulus needs at least 2 prime factors")
+    with phase("keygen"):
+        prime_bits = bits // primes
+
+        with phase("primes"):
+            if workers > 1 or seed is not None:
+                factors = _search_primes(prime_bits, primes, workers, seed)
+            else:
+                factors = []
+                for _ in range(MAX_DRAWS_PER_PRIME * primes):
+                    # Ensure distinct
+                    p = generate_gaussian_prime(prime_bits)
+                    if p not in factors:
+                        factors.append(p)
+                        if len(factors) == primes:
+                            break
+                else:
+                    raise _too_small(prime_bits, primes)
+
+        with phase("exponents"):
+            N = math.prod(factors[1:], start=factors[0])
+
+            # phi(N) = (N(pi)-1)(N(rho)-1)...
+            phi_N = math.prod(p.norm() - 1 for p in factors)
+
+            e = 65537
+            while math.gcd(e, phi_N) != 1:
+                e += 2
+
+            d = pow(e, -1, phi_N)
 
-def encrypt(message_int, public_key):
+        public_key = GaussianRSAKey((e, N))
+        if not crt:
+            return public_key, GaussianRSAKey((d, N), factors=factors, phi=phi_N)
+
+        with phase("crt"):
+            # Z[i]/(pi) is a field with N(pi) elements, so exponents
+            # can be reduced modulo N(pi) - 1 (likewise for rho).
+            pi, rho = factors[:2]
+            d_pi = d % (pi.norm() - 1)
+            d_rho = d % (rho.norm() - 1)
+            q_inv = mod_inverse_gaussian(rho, pi)
+            private_key = (d, N, pi, rho, d_pi, d_rho, q_inv)
+            if primes > 2:
+                # Further factors r follow as in PKCS #1 multi-prime keys:
+                # triples (r, d mod (N(r) - 1), R^-1 mod r), where R is the
+                # product of all factors before r.
+                extra = []
+                R = pi * rho
+                for r in factors[2:]:
+                    extra.append((r, d % (r.norm() - 1), mod_inverse_gaussian(R, r)))
+                    R = R * r
+                private_key += (tuple(extra),)
+        return public_key, GaussianRSAKey(private_key, phi=phi_N)
+
+def key_factors(private_key):
+    # Prime factors of N held by a CRT private key, () for a plain one.
+    if len(private_key) <= 2:
+        return ()
+    extra = private_key[7] if len(private_key) > 7 else ()
+    return (private_key[2], private_key[3]) + tuple(t[0] for t in extra)
+
+def key_fingerprint(key):
+    # SHA-256 of the modulus N; identical for a public key, its private
+    # key (plain or CRT) and N itself.
+    import hashlib
+    N = key if isinstance(key, GaussianInt) else key[1]
+    h = hashlib.sha256(b"GaussianRSA")
+    for v in (N.real, N.imag):
+        b = v.to_bytes((v.bit_length() + 8) // 8, 'big', signed=True)
+        h.update(len(b).to_bytes(4, 'big') + b)
+    return h.digest()
+
+def key_context(key):
+    # Reduction constants for a public or private key. Build once and pass
+    # as ctx to encrypt/decrypt so per-block calls skip the setup.
+    # CRT private keys get contexts for N and each factor, in key order.
+    # A GaussianRSAKey hands out its cached contexts.
+    if isinstance(key, GaussianRSAKey):
+        return key.context
+    return _build_context(key)
+
+def _build_context(key):
+    if len(key) > 2:
+        return (ReductionContext(key[1]),) + tuple(ReductionContext(p) for p in key_factors(key))
+    return ReductionContext(key[1])
+
+class GaussianRSAKey(tuple):
+    # A key tuple, (e, N), (d, N) or a CRT private key, that computes its
+    # derived values on first use and keeps them: norm and conjugate of N,
+    # prime factors, phi(N), reduction contexts, sliding-window recodings
+    # of the exponents and the fingerprint. Being a tuple, it goes
+    # wherever a key tuple does (keystore, pickling, tuple unpacking);
+    # encrypt, decrypt and key_context pick up the cached values.
+    #
+    # factors and phi can be given when known, as generate_keypair does
+    # for plain private keys, which do not carry them.
+    def __new__(cls, key, factors=None, phi=None):
+        self = super().__new__(cls, key)
+        if factors is not None:
+            self.factors = tuple(factors)
+        if phi is not None:
+            self.phi = phi
+        return self
+
+    @property
+    def exponent(self):
+        return self[0]
+
+    @property
+    def modulus(self):
+        return self[1]
+
+    @property
+    def is_crt(self):
+        return len(self) > 2
+
+    @cached_property
+    def norm(self):
+        return self[1].norm()
+
+    @cached_property
+    def conj(self):
+        return self[1].conj()
+
+    @cached_property
+    def factors(self):
+        return key_factors(self)
+
+    @cached_property
+    def phi(self):
+        # phi(N), or None for a public or plain key with unknown factors.
+        if not self.factors:
+            return None
+        return math.prod(p.norm() - 1 for p in self.factors)
+
+    @cached_property
+    def context(self):
+        return _build_context(self)
+
+    @cached_property
+    def window(self):
+        return sliding_window_steps(self[0])
+
+    @cached_property
+    def crt_windows(self):
+        # Recodings of d_pi, d_rho and each extra factor's exponent.
+        extra = self[7] if len(self) > 7 else ()
+        return tuple(sliding_window_steps(d) for d in (self[4], self[5]) + tuple(t[1] for t in extra))
+
+    @cached_property
+    def fingerprint(self):
+        return key_fingerprint(self)
+
+def encrypt(message_int, public_key, ctx=None):
     e, N = public_key
-    return mod_pow_gaussian(message_int, e, N)
+    window = None
+    if isinstance(public_key, GaussianRSAKey):
+        window = public_key.window
+        if ctx is None:
+            ctx = public_key.context
+    with phase("encrypt"):
+        return mod_pow_gaussian(message_int, e, N, ctx, window)
+
+class Encryptor:
+    # Encrypts many blocks under one public key. The reduction context and
+    # the sliding-window recoding of e are built once per key. With
+    # cache_size > 0, a bounded LRU cache maps recent messages to their
+    # ciphertexts (RSA encryption is deterministic here).
+    def __init__(self, public_key, cache_size=0):
+        self.public_key = public_key
+        self.e, self.N = public_key
+        self.ctx = key_context(public_key)
+        if isinstance(public_key, GaussianRSAKey):
+            self.window = public_key.window
+        else:
+            self.window = sliding_window_steps(self.e)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
 
-def decrypt(ciphertext_int, private_key):
+    def encrypt(self, message_int):
+        if not self.cache_size:
+            with phase("encrypt"):
+                return mod_pow_gaussian(message_int, self.e, self.N, self.ctx, self.window)
+
+        cache = self._cache
+        c = cache.get(message_int)
+        if c is not None:
+            self.hits += 1
+            cache.move_to_end(message_int)
+            return c
+        self.misses += 1
+        with phase("encrypt"):
+            c = mod_pow_gaussian(message_int, self.e, self.N, self.ctx, self.window)
+        cache[message_int] = c
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+            self.evictions += 1
+        return c
+
+    __call__ = encrypt
+
+    def encrypt_all(self, blocks):
+        return [self.encrypt(b) for b in blocks]
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._cache), "capacity": self.cache_size}
+
+    def clear_cache(self):
+        self._cache.clear()
+        self.hits = self.misses = self.evictions = 0
+
+def decrypt(ciphertext_int, private_key, ctx=None):
+    if len(private_key) > 2:
+        return decrypt_crt(ciphertext_int, private_key, ctx)
     d, N = private_key
-    return mod_pow_gaussian(ciphertext_int, d, N)
+    window = None
+    if isinstance(private_key, GaussianRSAKey):
+        window = private_key.window
+        if ctx is None:
+            ctx = private_key.context
+    with phase("decrypt"):
+        return mod_pow_gaussian(ciphertext_int, d, N, ctx, window)
+
+def decrypt_crt(ciphertext_int, private_key, ctx=None):
+    # Private key (d, N, pi, rho, d_pi, d_rho, q_inv) with q_inv = rho^-1 mod pi.
+    # Two half-size exponentiations, recombined with Garner's formula:
+    # m = m_rho + rho * ((m_pi - m_rho) * q_inv mod pi)
+    # Multi-prime keys carry an eighth item of (r, d_r, t_r) triples; each
+    # adds one exponentiation mod r and one more Garner step.
+    _, N, pi, rho, d_pi, d_rho, q_inv = private_key[:7]
+    extra = private_key[7] if len(private_key) > 7 else ()
+    with phase("decrypt_crt"):
+        if ctx is None:
+            ctx = key_context(private_key)
+        ctx_n, ctx_pi, ctx_rho, *ctx_extra = ctx
+        if isinstance(private_key, GaussianRSAKey):
+            w_pi, w_rho, *w_extra = private_key.crt_windows
+        else:
+            w_pi = w_rho = None
+            w_extra = [None] * len(extra)
+
+        with phase("pow_pi"):
+            m_pi = mod_pow_gaussian(ciphertext_int, d_pi, pi, ctx_pi, w_pi)
+        with phase("pow_rho"):
+            m_rho = mod_pow_gaussian(ciphertext_int, d_rho, rho, ctx_rho, w_rho)
+
+        with phase("garner"):
+            h = ctx_pi.mod((m_pi - m_rho) * q_inv)
+            m = m_rho + rho * h
+        if not extra:
+            return ctx_n.mod(m)
+
+        # m is now the residue modulo R = pi * rho; extend it one factor
+        # at a time, m = m + R * ((m_r - m) * t_r mod r).
+        R = pi * rho
+        for (r, d_r, t_r), ctx_r, w_r in zip(extra, ctx_extra, w_extra):
+            with phase("pow_extra"):
+                m_r = mod_pow_gaussian(ciphertext_int, d_r, r, ctx_r, w_r)
+            with phase("garner"):
+                m = m + R * ctx_r.mod((m_r - m) * t_r)
+                R = R * r
+        return ctx_n.mod(m)
+
+# Batch API. Each pool worker receives the key once, through the pool
+# initializer, and builds its reduction context there; tasks then carry
+# only the blocks.
+_worker_key = None
+_worker_ctx = None
+
+def _init_worker(key):
+    global _worker_key, _worker_ctx
+    _worker_key = key
+    _worker_ctx = key_context(key)
+
+def _encrypt_in_worker(block):
+    return encrypt(block, _worker_key, _worker_ctx)
+
+def _decrypt_in_worker(block):
+    return decrypt(block, _worker_key, _worker_ctx)
+
+def _run_batch(op, worker_op, blocks, key, workers, chunksize):
+    blocks = list(blocks)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(blocks))
+    if workers <= 1:
+        ctx = key_context(key)
+        results = []
+        for b in blocks:
+            if _stop_event is not None and _stop_event.is_set():
+                raise Cancelled
+            results.append(op(b, key, ctx))
+        return results
+
+    from concurrent.futures import ProcessPoolExecutor
+    if chunksize is None:
+        # A few chunks per worker keeps the load balanced without paying
+        # inter-process overhead per block.
+        chunksize = max(1, -(-len(blocks) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(key,)) as pool:
+        return list(pool.map(worker_op, blocks, chunksize=chunksize))
+
+def encrypt_batch(blocks, public_key, workers=None, chunksize=None):
+    # Encrypt an iterable of GaussianInt blocks over a process pool.
+    # Results come back in input order. workers defaults to the CPU count;
+    # workers=1 runs in-process.
+    return _run_batch(encrypt, _encrypt_in_worker, blocks, public_key, workers, chunksize)
+
+def decrypt_batch(blocks, private_key, workers=None, chunksize=None):
+    # Decrypt an iterable of GaussianInt blocks, see encrypt_batch.
+    return _run_batch(decrypt, _decrypt_in_worker, blocks, private_key, workers, chunksize)
@@ -0,0 +1,286 @@
+import argparse
+import asyncio
+import functools
+import json
+import multiprocessing
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from .gaussian_math import GaussianInt
+from .rsa_core import generate_keypair, encrypt, decrypt, key_context, key_fingerprint
+from .keystore import KeyStore
+
+# Headless encryption service.
+#
+# Wire format: every message is a 4-byte big-endian length followed by
+# that many bytes of UTF-8 JSON. Requests carry an "id" that is echoed in
+# the response, so a client may pipeline requests and responses may come
+# back out of order. Gaussian integers are [real, imag] pairs.
+#
+#   {"id": 1, "op": "keygen", "bits": 128}
+#       -> {"id": 1, "ok": true, "key_id": "<hex>", "e": 65537, "N": [r, i]}
+#   {"id": 2, "op": "encrypt", "key_id": "<hex>", "blocks": [[r, i], ...]}
+#       -> {"id": 2, "ok": true, "blocks": [[r, i], ...]}
+#   {"id": 3, "op": "decrypt", "key_id": "<hex>", "blocks": [[r, i], ...]}
+#       -> {"id": 3, "ok": true, "blocks": [[r, i], ...]}
+#
+# Errors are reported as {"id": ..., "ok": false, "error": "..."}.
+# Private keys never leave the server.
+
+HEADER = struct.Struct(">I")
+MAX_FRAME = 64 << 20
+# Key sizes accepted by keygen.
+MIN_BITS, MAX_BITS = 16, 8192
+
+async def read_frame(reader):
+    header = await reader.readexactly(HEADER.size)
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ValueError(f"Frame of {length} bytes exceeds limit")
+    return json.loads(await reader.readexactly(length))
+
+def encode_frame(msg):
+    data = json.dumps(msg, separators=(",", ":")).encode()
+    return HEADER.pack(len(data)) + data
+
+# Runs in pool workers. Contexts are cached per worker, so a key's setup
+# is paid once per process rather than once per batch.
+_cached_context = functools.lru_cache(maxsize=64)(key_context)
+
+def _process_blocks(op, key, blocks):
+    ctx = _cached_context(key)
+    fn = encrypt if op == "encrypt" else decrypt
+    out = []
+    for r, i in blocks:
+        c = fn(GaussianInt(r, i), key, ctx)
+        out.append((c.real, c.imag))
+    return out
+
+class _Batcher:
+    # Collects concurrent requests for one (op, key) and runs them as a
+    # single pool task: requests arriving within `window` seconds, or
+    # until `max_blocks` is reached, share one round trip to a worker.
+    def __init__(self, service, op, key):
+        self.service = service
+        self.op = op
+        self.key = key
+        self.pending = []
+        self.count = 0
+        self.timer = None
+
+    def submit(self, blocks):
+        fut = asyncio.get_running_loop().create_future()
+        self.pending.append((blocks, fut))
+        self.count += len(blocks)
+        if self.count >= self.service.max_blocks:
+            self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.service.window, self.flush)
+        return fut
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending, self.count = self.pending, [], 0
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        blocks = [b for request, _ in batch for b in request]
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.service.pool, _process_blocks,
+                                                 self.op, self.key, blocks)
+        except Exception as exc:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        start = 0
+        for request, fut in batch:
+            if not fut.done():
+                fut.set_result(results[start : start + len(request)])
+            start += len(request)
+
+def _int(value, what):
+    # JSON integers only: floats, strings and booleans would otherwise be
+    # silently converted and processed as a different value.
+    if type(value) is not int:
+        raise ValueError(f"{what} must be an integer, got {value!r}")
+    return value
+
+def _block(pair):
+    if not isinstance(pair, list) or len(pair) != 2:
+        raise ValueError(f"block must be a [real, imag] pair, got {pair!r}")
+    return (_int(pair[0], "block component"), _int(pair[1], "block component"))
+
+class CryptoService:
+    """
+    asyncio front-end for rsa_core. CPU work runs in a process pool, so one
+    connection's large request never blocks the others; small concurrent
+    requests under the same key are batched into one pool task.
+
+    With a KeyStore, generated keys are persisted and any stored key can
+    be used by id, so a restarted service keeps serving the same keys.
+    """
+    def __init__(self, workers=None, window=0.002, max_blocks=256, crt=True, store=None):
+        # Forked workers would inherit open client sockets and keep them
+        # from ever seeing EOF; forkserver children start from a clean process.
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+        self.window = window
+        self.max_blocks = max_blocks
+        self.crt = crt
+        self.store = store
+        self.keys = {}
+        self._batchers = {}
+
+    async def handle(self, msg):
+        op = msg.get("op")
+        if op == "keygen":
+            bits = _int(msg.get("bits", 128), "bits")
+            if not MIN_BITS <= bits <= MAX_BITS:
+                raise ValueError(f"bits must be between {MIN_BITS} and {MAX_BITS}")
+            loop = asyncio.get_running_loop()
+            public_key, private_key = await loop.run_in_executor(
+                self.pool, generate_keypair, bits, self.crt)
+            key_id = key_fingerprint(public_key).hex()
+            self.keys[key_id] = (public_key, private_key)
+            if self.store is not None:
+                self.store.put((public_key, private_key))
+            e, N = public_key
+            return {"key_id": key_id, "e": e, "N": [N.real, N.imag]}
+        if op in ("encrypt", "decrypt"):
+            key_id = msg.get("key_id")
+            keys = self.keys.get(key_id)
+            if keys is None and self.store is not None and isinstance(key_id, str) and key_id in self.store:
+                keys = self.keys[key_id] = self.store.get(key_id)
+            if keys is None:
+                raise KeyError(f"Unknown key_id {msg.get('key_id')!r}")
+            key = keys[0] if op == "encrypt" else keys[1]
+            blocks = msg.get("blocks", [])
+            if not isinstance(blocks, list):
+                raise ValueError("blocks must be a list of [real, imag] pairs")
+            blocks = [_block(b) for b in blocks]
+            batcher = self._batchers.get((op, msg["key_id"]))
+            if batcher is None:
+                batcher = self._batchers[(op, msg["key_id"])] = _Batcher(self, op, key)
+            results = await batcher.submit(blocks)
+            return {"blocks": [list(c) for c in results]}
+        raise ValueError(f"Unknown op {op!r}")
+
+    async def serve_connection(self, reader, writer):
+        tasks = set()
+        try:
+            while True:
+                try:
+                    msg = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                task = asyncio.ensure_future(self._respond(msg, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, msg, writer):
+        req_id = msg.get("id") if isinstance(msg, dict) else None
+        try:
+            if not isinstance(msg, dict):
+                raise ValueError("Request must be a JSON object")
+            reply = {"id": req_id, "ok": True}
+            reply.update(await self.handle(msg))
+        except Exception as exc:
+            reply = {"id": req_id, "ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        writer.write(encode_frame(reply))
+        await writer.drain()
+
+    async def start(self, host="127.0.0.1", port=8765, path=None):
+        if path is not None:
+            return await asyncio.start_unix_server(self.serve_connection, path=path)
+        return await asyncio.start_server(self.serve_connection, host, port)
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+class Client:
+    """
+    Minimal client; concurrent call()s on one connection are pipelined.
+    """
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._next_id = 0
+        self._waiting = {}
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _read_loop(self):
+        try:
+            while True:
+                msg = await read_frame(self.reader)
+                fut = self._waiting.pop(msg.get("id"), None)
+                if fut is not None and not fut.done():
+                    fut.set_result(msg)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            for fut in self._waiting.values():
+                if not fut.done():
+                    fut.set_exception(ConnectionError("Connection closed"))
+
+    async def call(self, op, **params):
+        self._next_id += 1
+        req_id = self._next_id
+        fut = asyncio.get_running_loop().create_future()
+        self._waiting[req_id] = fut
+        self.writer.write(encode_frame(dict(params, id=req_id, op=op)))
+        await self.writer.drain()
+        reply = await fut
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+        return reply
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        self._reader_task.cancel()
+
+async def _serve(args):
+    store = KeyStore(args.store) if args.store else None
+    service = CryptoService(workers=args.workers, window=args.window / 1000, store=store)
+    server = await service.start(args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Gaussian RSA service listening on {where}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gaussian RSA asyncio service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--window", type=float, default=2.0, help="batching window in ms")
+    parser.add_argument("--store", help="key store directory for persistent keys")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
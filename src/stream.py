@@ -0,0 +1,56 @@
+import os
+from .rsa_core import encrypt, decrypt, key_context
+from .utils import read_chunks, iter_encode, iter_decode
+from .container import CiphertextWriter, CiphertextReader
+
+# Streaming encryption: data flows through generators block by block,
+# so memory use stays constant regardless of input size.
+
+def encrypt_stream(byte_chunks, public_key, ctx=None):
+    """
+    Encodes and encrypts an iterable of bytes, yielding ciphertext blocks.
+    """
+    if ctx is None:
+        ctx = key_context(public_key)
+    N = public_key[1]
+    for block in iter_encode(byte_chunks, N.norm()):
+        yield encrypt(block, public_key, ctx)
+
+def decrypt_stream(blocks, private_key, ctx=None):
+    """
+    Decrypts and decodes an iterable of ciphertext blocks, yielding bytes.
+    """
+    if ctx is None:
+        ctx = key_context(private_key)
+    N = private_key[1]
+    return iter_decode((decrypt(c, private_key, ctx) for c in blocks), N.norm())
+
+def encrypt_file(src_path, dst_path, public_key, chunk_size=1 << 16):
+    """
+    Encrypts a binary file of any size into a ciphertext container file.
+    """
+    with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        writer = CiphertextWriter(dst, public_key)
+        writer.write_all(encrypt_stream(read_chunks(src, chunk_size), public_key))
+
+def decrypt_file(src_path, dst_path, private_key):
+    """
+    Decrypts a file written by encrypt_file back to the original bytes.
+    The key is checked before dst_path is touched, and the output goes
+    through a temporary file and os.replace, so a wrong key or a corrupt
+    container leaves an existing dst_path as it was.
+    """
+    with CiphertextReader(src_path) as reader:
+        reader.check_key(private_key)
+        tmp = dst_path + ".tmp"
+        try:
+            with open(tmp, 'wb') as dst:
+                for data in decrypt_stream(reader, private_key):
+                    dst.write(data)
+            os.replace(tmp, dst_path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+            raise
@@ -8,10 +8,10 @@ def int_to_bytes(i):
     if i == 0: return b'\x00'
     return i.to_bytes((i.bit_length() + 7) // 8, 'big')
 
-def encode_message(message, N_norm):
+def component_bytes(N_norm):
     """
-    Encodes a string message into a list of Gaussian Integers.
-    N_norm is the norm of the modulus N.
+    Number of message bytes stored in each component (real or imag)
+    of a block for a modulus of norm N_norm.
     """
     # Max bits we can safely store in a Gaussian integer M such that M is recoverable.
     # We want M to be in the "main" residue class.
@@ -29,6 +29,88 @@ def encode_message(message, N_norm):
     chunk_size = half_bits // 8 # bytes per component
     if chunk_size < 1:
         chunk_size = 1
+    return chunk_size
+
+def packed_bits(N_norm):
+    """
+    Bits per component in packed mode: the largest k such that every
+    block with components in [0, 2^k) is its own canonical residue
+    modulo N, i.e. survives encryption and decryption unchanged.
+    """
+    # |M| < 2^(k + 1/2) and N(M conj(N)) = N(M) N_norm, so both
+    # components of M / N stay below 1/2 when 2^k < sqrt(N_norm / 8).
+    k = (N_norm.bit_length() - 1) // 2 - 2
+    if k < 1:
+        raise ValueError("Modulus too small for packed encoding")
+    return k
+
+def _varint(n):
+    # Unsigned LEB128.
+    out = bytearray()
+    while True:
+        out.append((n & 0x7f) | (0x80 if n > 0x7f else 0))
+        n >>= 7
+        if not n:
+            return bytes(out)
+
+def _read_varint(data):
+    n = shift = 0
+    for i, b in enumerate(data):
+        n |= (b & 0x7f) << shift
+        shift += 7
+        if not b & 0x80:
+            return n, i + 1
+    raise ValueError("Truncated length header")
+
+def _encode_packed(message_bytes, N_norm):
+    # The bytes, prefixed with their length, are cut into k-bit components
+    # with no byte alignment. k bytes are exactly 8 components, so the
+    # stream is converted k bytes at a time.
+    k = packed_bits(N_norm)
+    mask = (1 << k) - 1
+    data = _varint(len(message_bytes)) + message_bytes
+    n_comps = -(-8 * len(data) // k)
+    n_comps += n_comps % 2
+    data += bytes(-len(data) % k)
+    comps = []
+    for i in range(0, len(data), k):
+        v = bytes_to_int(data[i : i + k])
+        comps.extend((v >> (k * j)) & mask for j in range(7, -1, -1))
+    return [GaussianInt(comps[j], comps[j + 1]) for j in range(0, n_comps, 2)]
+
+def _decode_packed(gaussian_chunks, N_norm):
+    k = packed_bits(N_norm)
+    comps = []
+    for g in gaussian_chunks:
+        comps.append(g.real)
+        comps.append(g.imag)
+    limit = 1 << k
+    if any(not 0 <= c < limit for c in comps):
+        raise ValueError("Block is not a packed message component")
+    comps.extend([0] * (-len(comps) % 8))
+    data = bytearray()
+    for i in range(0, len(comps), 8):
+        v = 0
+        for c in comps[i : i + 8]:
+            v = (v << k) | c
+        data += v.to_bytes(k, 'big')
+    length, start = _read_varint(data)
+    if start + length > len(data):
+        raise ValueError("Packed message is shorter than its length header")
+    return data[start : start + length]
+
+def encode_message(message, N_norm, packed=False):
+    """
+    Encodes a string message into a list of Gaussian Integers.
+    N_norm is the norm of the modulus N.
+
+    With packed=True each component carries packed_bits(N_norm) bits,
+    close to the modulus capacity and not rounded to whole bytes, after
+    a length header; decode with decode_message(..., N_norm, packed=True).
+    """
+    if packed:
+        return _encode_packed(message.encode('utf-8'), N_norm)
+    chunk_size = component_bytes(N_norm)
         
     # We will put text in both real and imag parts to double capacity?
     # Or just Text -> Real, Random -> Imag?
@@ -56,10 +138,16 @@ def encode_message(message, N_norm):
         
     return gaussian_chunks
 
-def decode_message(gaussian_chunks):
+def decode_message(gaussian_chunks, N_norm=None, packed=False):
     """
     Decodes a list of Gaussian Integers back to string.
+    Packed messages (see encode_message) need N_norm and are exact.
     """
+    if packed:
+        if N_norm is None:
+            raise ValueError("Packed decoding needs N_norm")
+        return _to_text(_decode_packed(gaussian_chunks, N_norm))
+
     decoded_bytes = bytearray()
     
     for g in gaussian_chunks:
@@ -73,7 +161,85 @@ def decode_message(gaussian_chunks):
             i_bytes = int_to_bytes(g.imag)
             decoded_bytes.extend(i_bytes)
             
+    return _to_text(decoded_bytes)
+
+def _to_text(decoded_bytes):
     try:
         return decoded_bytes.decode('utf-8')
     except UnicodeDecodeError:
         return decoded_bytes.decode('utf-8', errors='replace')
+
+def read_chunks(f, size=1 << 16):
+    """
+    Yields successive byte strings of at most `size` bytes from a binary file.
+    """
+    while True:
+        data = f.read(size)
+        if not data:
+            return
+        yield data
+
+def iter_encode(byte_chunks, N_norm):
+    """
+    Streaming encoder for binary data, using the same block layout as
+    encode_message. byte_chunks is any iterable of bytes.
+
+    Every block carries exactly 2 * component_bytes(N_norm) bytes, the
+    last one zero-padded. It is followed by a terminator block
+    GaussianInt(n, 0), n being the number of valid bytes in the last
+    block, so decoding is exact for arbitrary bytes.
+
+    Raises ValueError for moduli too small to hold a whole byte-aligned
+    component as a canonical residue (see packed_bits).
+    """
+    chunk_size = component_bytes(N_norm)
+    if 8 * chunk_size > packed_bits(N_norm):
+        raise ValueError("Modulus too small for streaming encoding")
+    block_size = 2 * chunk_size
+    buffer = bytearray()
+    last = 0
+    
+    for data in byte_chunks:
+        buffer.extend(data)
+        start = 0
+        while len(buffer) - start >= block_size:
+            r_val = bytes_to_int(buffer[start : start + chunk_size])
+            i_val = bytes_to_int(buffer[start + chunk_size : start + block_size])
+            start += block_size
+            last = block_size
+            yield GaussianInt(r_val, i_val)
+        del buffer[:start]
+        
+    if buffer:
+        last = len(buffer)
+        buffer.extend(bytes(block_size - last))
+        yield GaussianInt(bytes_to_int(buffer[:chunk_size]), bytes_to_int(buffer[chunk_size:]))
+        
+    yield GaussianInt(last, 0)
+
+def iter_decode(gaussian_chunks, N_norm):
+    """
+    Inverse of iter_encode: yields the original bytes block by block.
+    Holds back only the last two blocks to find the terminator.
+    """
+    chunk_size = component_bytes(N_norm)
+    limit = 1 << (8 * chunk_size)
+    pending = []
+
+    def block_bytes(g):
+        if not (0 <= g.real < limit and 0 <= g.imag < limit):
+            raise ValueError("Corrupt stream: block out of range")
+        return g.real.to_bytes(chunk_size, 'big') + g.imag.to_bytes(chunk_size, 'big')
+    
+    for g in gaussian_chunks:
+        pending.append(g)
+        if len(pending) > 2:
+            yield block_bytes(pending.pop(0))
+            
+    if not pending or pending[-1].imag != 0 or not 0 <= pending[-1].real <= 2 * chunk_size:
+        raise ValueError("Truncated stream: missing terminator block")
+    last = pending[-1].real
+    if len(pending) == 2:
+        yield block_bytes(pending[0])[:last]
+    elif last != 0:
+        raise ValueError("Truncated stream: missing final block")